@@ -1,16 +1,22 @@
 import re
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime, timedelta
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, Cookie, status
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 from app.core.logger import get_auth_logger
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.db.models import User
 
 ####################################################
@@ -22,6 +28,18 @@ class UserResponse(BaseModel):
     name: str
     email: str
 
+class Principal(BaseModel):
+    """The authenticated user as requests see it: an immutable snapshot, safe to share from the cache"""
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    name: Optional[str] = None
+    email: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, name=user.name, email=user.email)
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -41,20 +59,73 @@ class UserSignup(BaseModel):
 ##############     ACTORS     ######################
 ####################################################
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so hashing never blocks the event
+    loop. bcrypt releases the GIL, so the workers use separate cores. Once
+    max_pending operations are queued or running, new ones are rejected.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_pending: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry shortly"
+            )
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.pending,
+            "workers": self.max_workers,
+            "rejected": self.rejected
+        }
+
 router = APIRouter()
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+metrics.register_collector("password_hashing", password_hasher.stats)
 logger = get_auth_logger()
 
+# Decoded access tokens and the users they resolve to, so polling endpoints
+# authenticate without touching the database
+token_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
 ####################################################
 #############     HELPER FUNCTIONS     #############
 ####################################################
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
 
 def validate_password(password: str) -> bool:
     if len(password) < 10:
@@ -73,7 +144,18 @@ def decode_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+def token_claims(user: User) -> dict:
+    """Claims carried by access and refresh tokens"""
+    return {"sub": user.email, "uid": user.id}
+
+def invalidate_user(user_id: Optional[int] = None, email: Optional[str] = None):
+    """Drop a cached principal after logout, refresh or a change to the user"""
+    if user_id is not None:
+        principal_cache.pop(("id", user_id))
+    if email is not None:
+        principal_cache.pop(("email", email))
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials"
@@ -83,22 +165,37 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)) -> U
     if not token:
         raise credentials_exception
 
-    payload = decode_token(token)
-    if not payload or "sub" not in payload:
-        raise credentials_exception
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if not payload or "sub" not in payload:
+            raise credentials_exception
+        # Never keep a token cached past its own expiry
+        token_cache.set(token, payload, ttl=min(settings.AUTH_CACHE_TTL_SECONDS, payload["exp"] - time.time()))
+
+    # Tokens issued before the uid claim existed fall back to the email lookup
+    key = ("id", payload["uid"]) if "uid" in payload else ("email", payload["sub"])
+    principal = principal_cache.get(key)
+    if principal is None:
+        if key[0] == "id":
+            user = await db.get(User, payload["uid"])
+        else:
+            user = (await db.execute(select(User).where(User.email == payload["sub"]))).scalar_one_or_none()
+        if not user:
+            raise credentials_exception
 
-    user = db.query(User).filter(User.email == payload["sub"]).first()
-    if not user:
-        raise credentials_exception
+        # A frozen copy, not the ORM instance, is what concurrent requests share
+        principal = Principal.from_user(user)
+        principal_cache.set(key, principal)
 
-    return user
+    return principal
 
 ###################################################
 #############     ROUTES     ######################
 ###################################################
 
 @router.post("/signup")
-async def signup(request: Request, user: UserSignup, db: Session = Depends(get_db)):
+async def signup(request: Request, user: UserSignup, db: AsyncSession = Depends(get_async_db)):
 
     try:
         client_ip = request.client.host
@@ -117,19 +214,20 @@ async def signup(request: Request, user: UserSignup, db: Session = Depends(get_d
                 detail="Password does not meet complexity requirements"
             )
 
-        if db.query(User).filter(User.email == user.email).first():
+        if (await db.execute(select(User.id).where(User.email == user.email))).first():
             logger.warning(f"Signup attempt with existing email: {user.email}. IP: {client_ip}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash(user.password)
         new_user = User(name=user.name, email=user.email, hashed_password=hashed_password)
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        invalidate_user(new_user.id, new_user.email)
 
         logger.info(f"New user registered: {user.email}. IP: {client_ip}")
         return {"message": "User created successfully"}
@@ -139,19 +237,19 @@ async def signup(request: Request, user: UserSignup, db: Session = Depends(get_d
         return {"message": "Catastrophic Failure in signup"}
 
 @router.post("/login")
-async def login(request: Request, response: Response, login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: Request, response: Response, login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     client_ip = request.client.host
-    user = db.query(User).filter(User.email == login_data.username).first()
+    user = (await db.execute(select(User).where(User.email == login_data.username))).scalar_one_or_none()
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password(login_data.password, user.hashed_password):
         logger.warning(f"Failed login attempt for email: {login_data.username}. IP: {client_ip}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
 
-    access_token = create_token({"sub": user.email})
-    refresh_token = create_token({"sub": user.email}, timedelta(days=7))
+    access_token = create_token(token_claims(user))
+    refresh_token = create_token(token_claims(user), timedelta(days=7))
 
     response.set_cookie(
         key="auth_token",
@@ -177,7 +275,9 @@ async def login(request: Request, response: Response, login_data: LoginRequest,
 async def logout(request: Request, response: Response, auth_token: Optional[str] = Cookie(None)):
     if auth_token:
         try:
+            token_cache.pop(auth_token)
             payload = decode_token(auth_token)
+            invalidate_user(payload.get('uid'), payload.get('sub'))
             user_email = payload.get('sub', 'Unknown')
             logger.info(f"Logout for user: {user_email}. IP: {request.client.host}")
         except:
@@ -188,7 +288,7 @@ async def logout(request: Request, response: Response, auth_token: Optional[str]
     return {"message": "Logged out successfully"}
 
 @router.get("/status")
-async def get_auth_status(current_user: User = Depends(get_current_user)):
+async def get_auth_status(current_user: Principal = Depends(get_current_user)):
     return {
         "user": {
             "id": str(current_user.id),
@@ -202,7 +302,7 @@ async def refresh_token(
     request: Request,
     response: Response,
     refresh_token: str = Cookie(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     client_ip = request.client.host
 
@@ -219,16 +319,18 @@ async def refresh_token(
         if not payload or "sub" not in payload:
             raise ValueError("Invalid token payload")
 
-        user = db.query(User).filter(User.email == payload["sub"]).first()
+        user = (await db.execute(select(User).where(User.email == payload["sub"]))).scalar_one_or_none()
         if not user:
             raise ValueError("User not found")
 
+        invalidate_user(user.id, user.email)
+
         access_token = create_token(
-            data={"sub": user.email},
+            data=token_claims(user),
             expires_delta=timedelta(hours=1)
         )
         new_refresh_token = create_token(
-            data={"sub": user.email},
+            data=token_claims(user),
             expires_delta=timedelta(days=7)
         )
 
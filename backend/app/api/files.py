@@ -0,0 +1,236 @@
+# backend/app/api/files.py
+# Serving finished clips: range requests, conditional requests, zero-copy,
+# or a redirect to a presigned URL when clips live in object storage
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+from urllib.request import Request as UrlRequest, urlopen
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import Principal, get_current_user
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from app.db.base import AsyncSessionLocal, get_async_read_db
+from app.db.models import Extraction, utcnow
+from app.video.storage import storage_for
+
+####################################################
+#############     ACTORS     #######################
+####################################################
+
+router = APIRouter()
+logger = get_videos_logger()
+settings = get_settings()
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 256 * 1024
+
+####################################################
+#############     HELPER FUNCTIONS     #############
+####################################################
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong validator: outputs are written once, so size + mtime identify the bytes"""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+def not_modified_since(header: Optional[str], stat: os.stat_result) -> bool:
+    try:
+        return header is not None and int(stat.st_mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Resolve a single-range Range header to an inclusive (start, end).
+    Returns None to serve the whole file (no header, or a multi-range request)
+    and raises ValueError when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        raise ValueError("Empty range")
+
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+async def record_access(video: Extraction):
+    """Keep last_accessed fresh for disk budget eviction, at most one write per resolution window"""
+    now = utcnow()
+    last = video.last_accessed
+    if last is not None and (now - last.replace(tzinfo=None)).total_seconds() < settings.LAST_ACCESSED_RESOLUTION_SECONDS:
+        return
+    # The request reads from a replica; the write goes to the primary
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Extraction).where(Extraction.id == video.id).values(last_accessed=now))
+        await db.commit()
+
+def read_range(path: str, start: int, end: int):
+    # A plain generator: StreamingResponse iterates it in the threadpool
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+####################################################
+#############     ROUTER     #######################
+####################################################
+
+@router.get("/videos/{video_id}/file")
+async def get_video_file(
+    video_id: int,
+    request: Request,
+    download: bool = False,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Stream a finished clip for playback, or as an attachment with ?download=true"""
+    video = await db.get(Extraction, video_id)
+    if not video or (video.creator_id != current_user.id and current_user.email != settings.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video not found"
+        )
+    if video.status != "completed" or not video.file_path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Video is {video.status}"
+        )
+
+    await record_access(video)
+    storage = storage_for(video.file_path)
+    filename = os.path.basename(video.file_path)
+    disposition = "attachment" if download else "inline"
+
+    # Object storage serves the bytes itself, ranges and all
+    url = storage.url(video.file_path, filename=filename, download=download)
+    if url:
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    path = storage.local_path(video.file_path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Video file is no longer available"
+        )
+
+    etag = file_etag(stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=3600"
+    }
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag) or (
+        if_none_match is None and not_modified_since(request.headers.get("if-modified-since"), stat)
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if_match = request.headers.get("if-match")
+    if if_match is not None and not etag_matches(if_match, etag):
+        return Response(status_code=status.HTTP_412_PRECONDITION_FAILED, headers=headers)
+
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, stat.st_size)
+    except ValueError:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{stat.st_size}"}
+        )
+
+    if byte_range is None:
+        # FileResponse lets the server use sendfile when it supports it
+        return FileResponse(
+            path,
+            media_type="video/mp4",
+            filename=filename,
+            headers=headers,
+            stat_result=stat,
+            content_disposition_type=disposition
+        )
+
+    start, end = byte_range
+    headers.update({
+        "Content-Range": f"bytes {start}-{end}/{stat.st_size}",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": f'{disposition}; filename="{filename}"'
+    })
+    return StreamingResponse(
+        read_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="video/mp4",
+        headers=headers
+    )
+
+def benchmark(url: str, auth_token: str, concurrency: int, requests: int, range_bytes: int = 0):
+    """Aggregate throughput for many concurrent downloads of one clip"""
+    def fetch(_) -> int:
+        headers = {"Cookie": f"auth_token={auth_token}"}
+        if range_bytes:
+            # What a player asks for first when it starts playback
+            headers["Range"] = f"bytes=0-{range_bytes - 1}"
+        received = 0
+        with urlopen(UrlRequest(url, headers=headers)) as response:
+            while chunk := response.read(CHUNK_SIZE):
+                received += len(chunk)
+        return received
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        total = sum(pool.map(fetch, range(requests)))
+    elapsed = time.monotonic() - started
+    print(f"{requests} requests x{concurrency}: {total / 1024 ** 2:.1f} MiB in {elapsed:.2f}s "
+          f"= {total / 1024 ** 2 / elapsed:.1f} MiB/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GET /api/videos/{id}/file under concurrency")
+    parser.add_argument("url", help="e.g. http://localhost:8000/api/videos/1/file")
+    parser.add_argument("--token", required=True, help="auth_token cookie value")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--range-bytes", type=int, default=0, help="fetch only the first N bytes of the clip")
+    args = parser.parse_args()
+
+    benchmark(args.url, args.token, args.concurrency, args.requests, args.range_bytes)
@@ -0,0 +1,129 @@
+# backend/app/api/loadtest.py
+# Concurrent load against a running API: listing, dashboard and login-storm latencies
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+def request(url: str, method: str = "GET", token: Optional[str] = None, body: dict = None) -> dict:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    if data is not None:
+        req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Cookie", f"auth_token={token}")
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return json.loads(response.read() or b"null")
+
+def login(base_url: str, email: str, password: str) -> str:
+    return request(f"{base_url}/api/auth/login", "POST", body={"username": email, "password": password})["access_token"]
+
+def seed(email: str, rows: int):
+    """Give the user `rows` completed extractions, straight into DATABASE_URL"""
+    from app.db.base import SessionLocal
+    from app.db.models import Extraction, ExtractionStatus, User
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == email).one()
+        for start in range(0, rows, 1000):
+            # Through the ORM so the status counts follow
+            db.add_all(
+                Extraction(
+                    youtube_url=f"https://open.spotify.com/episode/loadtest{i}",
+                    start_time="0:00",
+                    end_time="0:30",
+                    status=ExtractionStatus.COMPLETED,
+                    progress=100,
+                    creator_id=user.id
+                )
+                for i in range(start, min(rows, start + 1000))
+            )
+            db.commit()
+
+def measure(fn, clients: int, requests: int) -> Dict[str, float]:
+    """Run fn `requests` times over `clients` threads and summarize the latencies"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            fn()
+        except (urllib.error.URLError, OSError):
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(pick(0.50), 1),
+        "p99_ms": round(pick(0.99), 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0
+    }
+
+def run(args) -> Dict[str, float]:
+    if args.seed:
+        seed(args.email, args.seed)
+    token = login(args.url, args.email, args.password)
+
+    if args.scenario == "videos":
+        query = f"?limit={args.limit}" if args.limit else ""
+        return measure(lambda: request(f"{args.url}/api/videos{query}", token=token), args.clients, args.requests)
+
+    if args.scenario == "dashboard":
+        return measure(lambda: request(f"{args.url}/api/dashboard/stats", token=token), args.clients, args.requests)
+
+    # login-storm: bcrypt-heavy logins in the background, cheap status checks measured
+    stop = threading.Event()
+
+    def storm():
+        while not stop.is_set():
+            try:
+                login(args.url, args.email, args.password)
+            except (urllib.error.URLError, OSError):
+                # 503s from the bounded hashing pool are part of the storm
+                pass
+
+    stormers = [threading.Thread(target=storm, daemon=True) for _ in range(args.logins)]
+    for thread in stormers:
+        thread.start()
+    try:
+        return measure(lambda: request(f"{args.url}/api/auth/status", token=token), args.clients, args.requests)
+    finally:
+        stop.set()
+        for thread in stormers:
+            thread.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a running API and report p50/p99 latency and throughput")
+    parser.add_argument("scenario", choices=["videos", "dashboard", "login-storm"])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--clients", type=int, default=200, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=None, help="page size for the videos scenario")
+    parser.add_argument("--logins", type=int, default=20, help="concurrent logins during login-storm")
+    parser.add_argument("--seed", type=int, default=0, help="first add this many completed extractions for the user")
+    args = parser.parse_args()
+
+    print(json.dumps({"scenario": args.scenario, **run(args)}))
@@ -1,28 +1,30 @@
-import os
-import re
-from datetime import datetime
-from typing import Optional
+import json
+import asyncio
+import base64
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
-import ffmpeg
 from pydantic import BaseModel
-from fastapi import APIRouter, BackgroundTasks
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.api.auth import get_current_user
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from redis import asyncio as aioredis
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only
+
+from app.api.auth import Principal, get_current_user
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 from app.core.logger import get_videos_logger
-from app.db.base import get_db, get_db_context
-from app.db.models import User, Extraction
 from app.core.websocket_manager import get_websocket_manager
-from app.video.spotify import SpotifyWorker
-
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.tasks.extraction import process_extraction
+from app.db.base import AsyncSessionLocal, get_async_db, get_async_read_db
+from app.db.models import User, Extraction, ExtractionStatus, ExtractionStatusCount, TERMINAL_STATUSES
+from app.tasks.extraction import event_stream_key, time_to_seconds
+from app.tasks.scheduler import get_scheduler
+from app.video.storage import storage_for
 from app.core.redis import get_redis
-from app.db.base import get_db
-from app.db.models import User, Extraction
 
 ####################################################
 #############     MDOELS     #######################
@@ -35,6 +37,9 @@ class ExtractionCreate(BaseModel):
     notes: str
     generateCaptions: bool
 
+class ExtractionBatchCreate(BaseModel):
+    clips: List[ExtractionCreate]
+
 ####################################################
 #############     ACTORS     #######################
 ####################################################
@@ -42,119 +47,149 @@ class ExtractionCreate(BaseModel):
 router = APIRouter()
 logger = get_videos_logger()
 settings = get_settings()
+dashboard_cache = TTLCache(maxsize=1024, ttl=settings.DASHBOARD_STATS_TTL_SECONDS)
+
+# Fields selectable through GET /videos?fields=, mapped to the columns they load
+VIDEO_FIELDS = {
+    "id": Extraction.id,
+    "youtube_url": Extraction.root_url,
+    "video_title": Extraction.video_title,
+    "start_time": Extraction.start_time,
+    "end_time": Extraction.end_time,
+    "notes": Extraction.notes,
+    "status": Extraction.status,
+    "progress": Extraction.progress,
+    "extraction_datetime": Extraction.extraction_datetime,
+    "creator_name": None  # joined from users
+}
 
 ####################################################
 #############     HELPER FUNCTIONS     #############
 ####################################################
 
-def time_to_seconds(time_str: str) -> int:
-    """Convert HH:MM:SS or MM:SS to seconds"""
-    parts = time_str.split(':')
-    if len(parts) == 2:
-        return int(parts[0]) * 60 + int(parts[1])
-    return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-
-def process_extraction(user_id: int, extraction_id: int, verbose: bool=False):
-    """Single function handling entire extraction process"""
-    ws_manager = get_websocket_manager()
-
-    def get_exception_meesage(e):
-        import sys, traceback
-        exc_type, exc_value, exc_traceback = sys.exc_info()
-        filename = traceback.extract_tb(exc_traceback)[-1].filename
-        line_number = traceback.extract_tb(exc_traceback)[-1].lineno
-        return f"{exc_type.__name__}: {str(e)}. {filename}:Line {line_number}"
-
-    def send_status_update(
-        status: str, 
-        progress: int, 
-        message: Optional[str] = None,
-        error: Optional[str] = None
-    ):
-        """Send properly formatted WebSocket update"""
-        if verbose:
-            print(f"Status: {status}   | {progress}%")
-            print(message)
-        else:
-            update = {
-                "status": status,
-                "progress": progress,
-                "message": message,
-                "error": error
-            }
-            ws_manager.send_extraction_update(
-                user_id=user_id,
-                extraction_id=extraction_id,
-                status=status,
-                progress=progress,
-                message=message,
-                error=error
-            )
-
-    with get_db_context() as db:
-        extraction = db.query(Extraction).get(extraction_id)
-        if not extraction:
-            return
-
-        try:
-            send_status_update("processing", 0, "Starting extraction...")
-            downloader = SpotifyWorker(settings.SPOTIFY_COOKIES_FILE)
-
-            try:
-                send_status_update("downloading", 25, "Downloading content")
-#               video_path = downloader.download_content(url=extraction.youtube_url)
-                video_path = downloader._download_spotify_content(url=extraction.youtube_url)
-
-                extraction.file_path = str(video_path)
-                db.commit()
-
-                if verbose:
-                    print(f"File downloaded: {video_path}")
-
-            except Exception as e:
-                logger.error(f"Download failed: {get_exception_meesage(e)}")
-                extraction.status = "failed"
-                db.commit()
-                raise
-
-            try:
-                start_seconds = time_to_seconds(extraction.start_time)
-                end_seconds = time_to_seconds(extraction.end_time)
-                duration = end_seconds - start_seconds
-
-                dt_tag = datetime.now().strftime("%Y%m%d-%H%M%S")
-                output_file = downloader.dest_dir / f"clip_{extraction_id}_{dt_tag}.mp4"
-
-                send_status_update("processing", 75, "Clipping video...")
-
-                stream = ffmpeg.input(str(video_path))
-                stream = ffmpeg.output(
-                    stream,
-                    str(output_file),
-                    ss=start_seconds,
-                    t=duration,
-                    acodec='copy',
-                    vcodec='copy'
-                )
-                ffmpeg.run(stream, overwrite_output=True, capture_stderr=True)
+def encode_cursor(extraction_datetime: datetime, extraction_id: int) -> str:
+    """Opaque keyset cursor for (extraction_datetime, id)"""
+    raw = f"{extraction_datetime.isoformat()}|{extraction_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-                extraction.status = "completed"
-                extraction.file_path = str(output_file)
-                db.commit()
+def naive_utc(value: datetime) -> datetime:
+    """Query bound in the columns' naive UTC; offsets given by the client are applied first"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
-                send_status_update("completed", 100, "Extraction complete!")
-
-            except Exception as e:
-                logger.error(f"Processing failed: {get_exception_meesage(e)}")
-                extraction.status = "failed"
-                db.commit()
-                raise
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        extraction_datetime, extraction_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(extraction_datetime), int(extraction_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def parse_stream_id(stream_id: str) -> Tuple[int, int]:
+    """Split a Redis stream entry id ("<ms>-<seq>") for ordering"""
+    try:
+        ms, seq = stream_id.split("-")
+        return int(ms), int(seq)
+    except Exception:
+        raise ValueError("Invalid stream id")
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+async def stream_extraction_events(
+    request: Request,
+    redis: aioredis.Redis,
+    stream: str,
+    last_event_id: Optional[str]
+) -> AsyncIterator[str]:
+    """Yield SSE frames from a Redis stream, starting after last_event_id"""
+    if last_event_id:
+        # Updates older than the trimmed stream are gone, the client must reload
+        oldest = await redis.xrange(stream, count=1)
+        if oldest and parse_stream_id(_text(oldest[0][0])) > parse_stream_id(last_event_id):
+            yield "event: reset\ndata: {}\n\n"
+        cursor = last_event_id
+    else:
+        # Pin the current tail so nothing published while we block is skipped
+        latest = await redis.xrevrange(stream, count=1)
+        cursor = _text(latest[0][0]) if latest else "0-0"
+
+    while not await request.is_disconnected():
+        entries = await redis.xread(
+            {stream: cursor},
+            count=100,
+            block=settings.SSE_HEARTBEAT_SECONDS * 1000
+        )
+        if not entries:
+            yield ": keep-alive\n\n"
+            continue
+
+        for _, messages in entries:
+            for entry_id, fields in messages:
+                cursor = _text(entry_id)
+                data = _text(fields.get(b"data", fields.get("data")))
+                yield f"id: {cursor}\nevent: extraction_update\ndata: {data}\n\n"
+
+def validate_clip_times(extraction: ExtractionCreate):
+    """Reject malformed ranges up front; the worker checks them against the episode length"""
+    try:
+        start_seconds = time_to_seconds(extraction.startTime)
+        end_seconds = time_to_seconds(extraction.endTime)
+    except (ValueError, IndexError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Times must be HH:MM:SS or MM:SS"
+        )
+    if start_seconds < 0 or end_seconds <= start_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time"
+        )
+    if end_seconds - start_seconds > settings.MAX_CLIP_DURATION_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Clips are limited to {settings.MAX_CLIP_DURATION_SECONDS} seconds"
+        )
 
+def new_extraction_row(extraction: ExtractionCreate, user: Principal) -> Extraction:
+    return Extraction(
+        youtube_url=extraction.youtubeUrl,
+        start_time=extraction.startTime,
+        end_time=extraction.endTime,
+        notes=extraction.notes[:300] if extraction.notes else None,
+        status="pending",
+        captions_generated=extraction.generateCaptions,
+        creator_id=user.id
+    )
+
+async def submit_groups(db: AsyncSession, user_id: int, groups: List[List[Extraction]]):
+    """
+    Hand committed rows to the scheduler, one job per group. If a job cannot
+    be queued (Redis down), it and every group after it are failed instead of
+    staying pending forever; groups queued before it keep running.
+    """
+    for index, rows in enumerate(groups):
+        try:
+            await asyncio.to_thread(get_scheduler().submit, user_id, [row.id for row in rows])
         except Exception as e:
-            msg = get_exception_meesage(e)
-            logger.error(f"Extraction failed: {msg}")
-            send_status_update("failed", 0, f"Extraction failed: {msg}")
-            raise
+            unqueued = [row for group in groups[index:] for row in group]
+            logger.error(f"Failed to queue extractions {[row.id for row in unqueued]}: {str(e)}")
+            metrics.incr("scheduler", "submit_failures")
+            for row in unqueued:
+                # Through the ORM so the status counts follow
+                row.update_status(ExtractionStatus.FAILED)
+                row.error_message = "Could not queue the extraction, please retry"
+            await db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Extraction queue unavailable, please retry"
+            )
+
+def source_key(url: str) -> str:
+    """Group key for clips of the same source, ignoring share-link query strings"""
+    parsed = urlparse(url.strip())
+    return parsed._replace(query="", fragment="").geturl().rstrip("/")
 
 ####################################################
 #############     ROUTER     #######################
@@ -162,48 +197,60 @@ def process_extraction(user_id: int, extraction_id: int, verbose: bool=False):
 
 @router.get("/dashboard/stats")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get dashboard statistics"""
     try:
-        total_users = db.query(User).count()
-
-        total_extractions = db.query(Extraction).count()
-        pending_extractions = db.query(Extraction).filter(Extraction.status == "pending").count()
-        completed_extractions = db.query(Extraction).filter(Extraction.status == "completed").count()
-        failed_extractions = db.query(Extraction).filter(Extraction.status == "failed").count()
-
-        user_extractions = db.query(Extraction).filter(Extraction.creator_id == current_user.id).count()
-        user_completed = db.query(Extraction).filter(
-            Extraction.creator_id == current_user.id,
-            Extraction.status == "completed"
-        ).count()
-
-        recent_extractions = db.query(Extraction)\
-            .order_by(Extraction.extraction_datetime.desc())\
-            .limit(5)\
-            .all()
+        system = dashboard_cache.get("system")
+        if system is None:
+            counts = dict((await db.execute(
+                select(ExtractionStatusCount.status, ExtractionStatusCount.count)
+            )).all())
+            recent_extractions = (await db.execute(
+                select(Extraction)
+                .order_by(Extraction.extraction_datetime.desc(), Extraction.id.desc())
+                .limit(5)
+            )).scalars().all()
+            total_users = (await db.execute(select(func.count(User.id)))).scalar()
+
+            system = {
+                "system_stats": {
+                    "total_users": total_users,
+                    "total_extractions": sum(counts.values()),
+                    "pending_extractions": counts.get("pending", 0),
+                    "completed_extractions": counts.get("completed", 0),
+                    "failed_extractions": counts.get("failed", 0)
+                },
+                "recent_activity": [{
+                    "id": extraction.id,
+                    "status": extraction.status,
+                    "youtube_url": extraction.youtube_url,
+                    "extraction_datetime": extraction.extraction_datetime,
+                    "creator_id": extraction.creator_id
+                } for extraction in recent_extractions]
+            }
+            dashboard_cache.set("system", system)
+
+        user_key = f"user:{current_user.id}"
+        user_stats = dashboard_cache.get(user_key)
+        if user_stats is None:
+            # One grouped pass over the (creator_id, status) index
+            user_counts = dict((await db.execute(
+                select(Extraction.status, func.count(Extraction.id))
+                .where(Extraction.creator_id == current_user.id)
+                .group_by(Extraction.status)
+            )).all())
+            user_stats = {
+                "total_extractions": sum(user_counts.values()),
+                "completed_extractions": user_counts.get("completed", 0)
+            }
+            dashboard_cache.set(user_key, user_stats)
 
         return {
-            "system_stats": {
-                "total_users": total_users,
-                "total_extractions": total_extractions,
-                "pending_extractions": pending_extractions,
-                "completed_extractions": completed_extractions,
-                "failed_extractions": failed_extractions
-            },
-            "user_stats": {
-                "total_extractions": user_extractions,
-                "completed_extractions": user_completed
-            },
-            "recent_activity": [{
-                "id": extraction.id,
-                "status": extraction.status,
-                "youtube_url": extraction.youtube_url,
-                "extraction_datetime": extraction.extraction_datetime,
-                "creator_id": extraction.creator_id
-            } for extraction in recent_extractions]
+            "system_stats": system["system_stats"],
+            "user_stats": user_stats,
+            "recent_activity": system["recent_activity"]
         }
     except Exception as e:
         logger.critical(f"Error while retrieving the dashboard: {e}")
@@ -212,44 +259,30 @@ async def get_dashboard_stats(
             detail=f"Error fetching dashboard stats: {str(e)}"
         )
 
-
-router = APIRouter()
-
 @router.post("/extract", status_code=status.HTTP_201_CREATED)
 async def create_extraction(
     extraction: ExtractionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        # Validation logic here...
-        
-        new_extraction = Extraction(
-            youtube_url=extraction.youtubeUrl,
-            start_time=extraction.startTime,
-            end_time=extraction.endTime,
-            notes=extraction.notes[:300] if extraction.notes else None,
-            status="pending",
-            captions_generated=extraction.generateCaptions,
-            creator_id=current_user.id
-        )
+        validate_clip_times(extraction)
+        new_extraction = new_extraction_row(extraction, current_user)
 
         db.add(new_extraction)
-        db.commit()
-        db.refresh(new_extraction)
+        await db.commit()
+        await db.refresh(new_extraction)
 
-        # Start Celery task
-        task = process_extraction.delay(
-            user_id=current_user.id,
-            extraction_id=new_extraction.id
-        )
+        # Queue behind the user's running jobs; the scheduler admits it fairly
+        await submit_groups(db, current_user.id, [[new_extraction]])
 
         return {
-            "message": "Extraction started",
-            "extraction_id": new_extraction.id,
-            "task_id": task.id
+            "message": "Extraction queued",
+            "extraction_id": new_extraction.id
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.critical(f"Error on Extraction: {str(e)}")
         raise HTTPException(
@@ -257,49 +290,144 @@ async def create_extraction(
             detail=str(e)
         )
 
+@router.post("/extract/batch", status_code=status.HTTP_201_CREATED)
+async def create_extraction_batch(
+    batch: ExtractionBatchCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many extractions at once. Clips are grouped by source so each
+    source is downloaded once and cut in a single ffmpeg pass.
+    """
+    if not batch.clips:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No clips requested"
+        )
+    if len(batch.clips) > settings.BATCH_MAX_CLIPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batches are limited to {settings.BATCH_MAX_CLIPS} clips"
+        )
+
+    try:
+        for clip in batch.clips:
+            validate_clip_times(clip)
+
+        groups = {}
+        for clip in batch.clips:
+            row = new_extraction_row(clip, current_user)
+            db.add(row)
+            groups.setdefault(source_key(clip.youtubeUrl), []).append(row)
+        await db.commit()
+
+        await submit_groups(db, current_user.id, list(groups.values()))
+        sources = [{"extraction_ids": [row.id for row in rows]} for rows in groups.values()]
+
+        return {
+            "message": "Extraction queued",
+            "extraction_ids": [row.id for rows in groups.values() for row in rows],
+            "sources": sources
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.critical(f"Error on batch Extraction: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
 @router.get("/videos")
 async def get_videos(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
     redis: aioredis.Redis = Depends(get_redis)
 ):
-    """Get videos with real-time status"""
+    """
+    Get one page of videos with real-time status, newest first.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
     try:
-        query = db.query(Extraction)
-        if current_user.email != settings.ADMIN:
-            query = query.filter(Extraction.creator_id == current_user.id)
+        requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(VIDEO_FIELDS)
+        unknown = set(requested) - set(VIDEO_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
 
-        videos = query.order_by(Extraction.extraction_datetime.desc()).all()
+        # The cursor and live status merge always need these columns
+        columns = {"id", "extraction_datetime", "status"} | {f for f in requested if VIDEO_FIELDS[f] is not None}
+        query = select(Extraction).options(load_only(*[VIDEO_FIELDS[c] for c in columns]))
+        if "creator_name" in requested:
+            query = query.options(joinedload(Extraction.creator).load_only(User.name))
+
+        if current_user.email != settings.ADMIN:
+            query = query.where(Extraction.creator_id == current_user.id)
+        if status_filter:
+            query = query.where(Extraction.status.in_([s.strip() for s in status_filter.split(",")]))
+        if since:
+            query = query.where(Extraction.extraction_datetime >= naive_utc(since))
+        if until:
+            query = query.where(Extraction.extraction_datetime < naive_utc(until))
+
+        if cursor:
+            try:
+                cursor_datetime, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            query = query.where(or_(
+                Extraction.extraction_datetime < cursor_datetime,
+                and_(Extraction.extraction_datetime == cursor_datetime, Extraction.id < cursor_id)
+            ))
+
+        videos = (await db.execute(
+            query.order_by(
+                Extraction.extraction_datetime.desc(),
+                Extraction.id.desc()
+            ).limit(limit + 1)
+        )).scalars().all()
+
+        if len(videos) > limit:
+            videos = videos[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(videos[-1].extraction_datetime, videos[-1].id)
 
-        # Update with real-time status from Redis
         result = []
         for video in videos:
-            video_dict = {
-                "id": video.id,
-                "youtube_url": video.youtube_url,
-                "video_title": video.video_title,
-                "start_time": video.start_time,
-                "end_time": video.end_time,
-                "notes": video.notes,
-                "status": video.status,
-                "progress": video.progress,
-                "extraction_datetime": video.extraction_datetime,
-                "creator_name": db.query(User).get(video.creator_id).name
-            }
-
-            # Check Redis for real-time status
-            redis_status = await redis.get(f'extraction:{video.id}:status')
-            if redis_status:
-                status_data = json.loads(redis_status)
-                video_dict.update({
-                    'status': status_data['status'],
-                    'progress': status_data['progress']
-                })
-
-            result.append(video_dict)
-
-        return result
+            video_dict = {field: getattr(video, field) for field in requested if field != "creator_name"}
+            if "creator_name" in requested:
+                video_dict["creator_name"] = video.creator.name if video.creator else None
+            result.append((video, video_dict))
+
+        # Only in-flight extractions can have a newer real-time status in Redis,
+        # fetch all of them in a single round trip
+        live = [(video, video_dict) for video, video_dict in result if video.status not in TERMINAL_STATUSES]
+        if live and ({"status", "progress"} & set(requested)):
+            redis_statuses = await redis.mget([f'extraction:{video.id}:status' for video, _ in live])
+            for (_, video_dict), redis_status in zip(live, redis_statuses):
+                if redis_status:
+                    status_data = json.loads(redis_status)
+                    for key in ("status", "progress"):
+                        if key in video_dict:
+                            video_dict[key] = status_data[key]
+
+        return [video_dict for _, video_dict in result]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving videos: {str(e)}")
         raise HTTPException(
@@ -310,17 +438,19 @@ async def get_videos(
 @router.get("/videos/status/{extraction_id}")
 async def get_videos_status(
     extraction_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the status for an extraction id"""
     try:
-        extraction = db.query(Extraction).filter(Extraction.id == extraction_id).first()
-
+        query = select(Extraction.id).where(
+            Extraction.id == extraction_id,
+            Extraction.status.notin_(TERMINAL_STATUSES)
+        )
         if current_user.email != settings.ADMIN:
-            query = query.filter(Extraction.creator_id == current_user.id)
+            query = query.where(Extraction.creator_id == current_user.id)
 
-        has_in_progress = db.query(query.exists()).scalar()
+        has_in_progress = (await db.execute(select(query.exists()))).scalar()
 
         return {
             "has_in_progress": has_in_progress
@@ -333,58 +463,116 @@ async def get_videos_status(
             detail=f"Database error: {str(e)}"
         )
 
+@router.get("/videos/events")
+async def get_video_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_user),
+    redis: aioredis.Redis = Depends(get_redis)
+):
+    """
+    Server-Sent Events stream of extraction updates. Reconnecting clients send
+    Last-Event-ID and receive only the updates they missed.
+    """
+    if last_event_id:
+        try:
+            parse_stream_id(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Last-Event-ID"
+            )
+
+    stream = event_stream_key() if current_user.email == settings.ADMIN else event_stream_key(current_user.id)
+    return StreamingResponse(
+        stream_extraction_events(request, redis, stream, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # don't let nginx buffer the stream
+        }
+    )
+
+@router.websocket("/ws")
+async def extraction_updates(websocket: WebSocket):
+    """Push extraction updates to the user as they are published"""
+    # A session only for the handshake: a dependency would hold its pooled
+    # connection (and read transaction) for as long as the socket stays open
+    try:
+        async with AsyncSessionLocal() as db:
+            current_user = await get_current_user(websocket, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    manager = get_websocket_manager()
+    await manager.connect(current_user.id, websocket, watch_all=current_user.email == settings.ADMIN)
+    try:
+        # Updates only flow server -> client; reading just detects the close
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(current_user.id, websocket)
+
 @router.delete("/videos/{video_id}")
 async def delete_video(
     video_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a video extraction if it belongs to the current user."""
     try:
         # Find the video and verify ownership
-        video = db.query(Extraction).filter(
-            Extraction.id == video_id,
-            Extraction.creator_id == current_user.id
-        ).first()
+        video = (await db.execute(
+            select(Extraction).where(
+                Extraction.id == video_id,
+                Extraction.creator_id == current_user.id
+            )
+        )).scalar_one_or_none()
 
         if not video:
-            print(f"DELETE: Video not found {video_id}")
+            logger.info(f"User {current_user.id} tried to delete missing video {video_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Video not found"
             )
 
-        # Delete the file if it exists
-        if video.file_path and os.path.exists(video.file_path):
+        # Only finished clips own their file; in-flight rows point at a shared source
+        if video.status == "completed" and video.file_path:
             try:
-                os.remove(video.file_path)
-            except OSError as e:
-                print(f"Error deleting file: {str(e)}")
+                await asyncio.to_thread(storage_for(video.file_path).delete, video.file_path)
+            except Exception as e:
+                logger.error(f"Error deleting {video.file_path}: {str(e)}")
                 # Continue with deletion even if file removal fails
 
         # Delete the database record
-        db.delete(video)
-        db.commit()
+        await db.delete(video)
+        await db.commit()
 
         return {"message": "Video deleted successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.critical(f"User '{current_user}' failed to delete {video_id}")
+        logger.critical(f"User {current_user.id} failed to delete {video_id}: {str(e)}")
         return {"message": "Video deletion unsuccessful"}
 
 @router.post("/videos/{video_id}/redownload")
 async def redownload_video(
     video_id: int,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Redownload a specific video for the current user"""
     try:
-        old_video = db.query(Extraction).filter(
-            Extraction.id == video_id,
-            Extraction.creator_id == current_user.id
-        ).first()
+        old_video = (await db.execute(
+            select(Extraction).where(
+                Extraction.id == video_id,
+                Extraction.creator_id == current_user.id
+            )
+        )).scalar_one_or_none()
 
         if not old_video:
             raise HTTPException(
@@ -402,13 +590,20 @@ async def redownload_video(
             captions_generated=old_video.captions_generated
         )
 
-        db.delete(old_video)
+        # Best effort, as in delete_video: a leftover file only costs space
+        if old_video.status == "completed" and old_video.file_path:
+            try:
+                await asyncio.to_thread(storage_for(old_video.file_path).delete, old_video.file_path)
+            except Exception as e:
+                logger.error(f"Error deleting {old_video.file_path} before redownload: {str(e)}")
+
+        await db.delete(old_video)
         db.add(new_video)
-        db.commit()
-        db.refresh(new_video)
+        await db.commit()
+        await db.refresh(new_video)
 
-        worker = ExtractionWorker(db)
-        background_tasks.add_task(worker.process_extraction, new_video.id)
+        # The source cache lets this skip the download if the episode is still on disk
+        await submit_groups(db, current_user.id, [[new_video]])
 
         return {
             "message": "Redownload started",
@@ -421,3 +616,17 @@ async def redownload_video(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Server error: {str(e)}"
         )
+
+@router.get("/metrics")
+async def get_metrics(
+    current_user: Principal = Depends(get_current_user),
+    redis: aioredis.Redis = Depends(get_redis)
+):
+    """Operational counters for sizing caches and workers (admin only)"""
+    if current_user.email != settings.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    return await metrics.snapshot(redis)
@@ -0,0 +1,60 @@
+# backend/app/core/metrics.py
+# Counters shared between the API and Celery processes, stored as Redis hashes
+
+from typing import Callable, Dict
+
+from .logger import get_app_logger
+from .redis import get_redis_pool
+
+METRICS_PREFIX = "metrics"
+
+logger = get_app_logger()
+
+# In-process values (e.g. pool queue depths) reported by the serving process
+_collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+def metrics_key(namespace: str) -> str:
+    return f"{METRICS_PREFIX}:{namespace}"
+
+def incr(namespace: str, name: str, amount: int = 1):
+    """Increment a counter. Metrics must never break the caller."""
+    try:
+        get_redis_pool().hincrby(metrics_key(namespace), name, amount)
+    except Exception as e:
+        logger.warning(f"Failed to record metric {namespace}.{name}: {e}")
+
+def set_gauge(namespace: str, name: str, value: float):
+    """Overwrite a point-in-time value"""
+    try:
+        get_redis_pool().hset(metrics_key(namespace), name, value)
+    except Exception as e:
+        logger.warning(f"Failed to record metric {namespace}.{name}: {e}")
+
+def observe(namespace: str, name: str, value: float):
+    """Accumulate a sample as <name>_sum / <name>_count so averages can be derived"""
+    try:
+        pipe = get_redis_pool().pipeline()
+        pipe.hincrbyfloat(metrics_key(namespace), f"{name}_sum", value)
+        pipe.hincrby(metrics_key(namespace), f"{name}_count", 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record metric {namespace}.{name}: {e}")
+
+def register_collector(namespace: str, collector: Callable[[], Dict[str, float]]):
+    """Report a process-local namespace alongside the shared Redis counters"""
+    _collectors[namespace] = collector
+
+async def snapshot(redis) -> Dict[str, Dict[str, float]]:
+    """Read every metrics namespace using the async Redis client"""
+    result = {}
+    async for key in redis.scan_iter(match=f"{METRICS_PREFIX}:*"):
+        key = key.decode() if isinstance(key, bytes) else key
+        values = await redis.hgetall(key)
+        result[key.split(":", 1)[1]] = {
+            (k.decode() if isinstance(k, bytes) else k): float(v)
+            for k, v in values.items()
+        }
+
+    for namespace, collector in _collectors.items():
+        result[namespace] = collector()
+    return result
@@ -0,0 +1,145 @@
+# backend/app/core/singleflight.py
+# Collapse concurrent work on the same key into a single execution
+
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from .config import get_settings
+from .redis import get_redis_pool
+
+# Delete the lease only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Redis-backed coordinator shared by every worker process. The first caller
+    for a key runs the work while holding a lease; later callers poll until the
+    leader publishes its result and reuse it. If the leader fails or dies the
+    lease is released or expires and one of the waiters takes over.
+    """
+
+    def __init__(
+        self,
+        redis,
+        namespace: str = "singleflight",
+        lease_seconds: int = 1800,
+        poll_interval: float = 1.0,
+        notify_interval: float = 5.0,
+        result_ttl: int = 600
+    ):
+        self.redis = redis
+        self.namespace = namespace
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.notify_interval = notify_interval
+        self.result_ttl = result_ttl
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], str],
+        on_wait: Optional[Callable[[float], None]] = None
+    ) -> Tuple[str, bool]:
+        """
+        Run fn once per key across all callers.
+        Returns the result and whether this caller was the leader.
+        """
+        lock_key = f"{self.namespace}:{key}:lock"
+        result_key = f"{self.namespace}:{key}:result"
+        token = uuid.uuid4().hex
+        started = time.monotonic()
+        last_notified = None
+
+        while True:
+            if self.redis.set(lock_key, token, nx=True, ex=self.lease_seconds):
+                try:
+                    result = fn()
+                    self.redis.set(result_key, result, ex=self.result_ttl)
+                    return result, True
+                finally:
+                    self.redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+
+            result = self.redis.get(result_key)
+            if result is not None:
+                return (result.decode() if isinstance(result, bytes) else result), False
+
+            waited = time.monotonic() - started
+            if waited > self.lease_seconds:
+                raise TimeoutError(f"Timed out waiting for shared work on '{key}'")
+
+            if on_wait and (last_notified is None or waited - last_notified >= self.notify_interval):
+                on_wait(waited)
+                last_notified = waited
+
+            time.sleep(self.poll_interval)
+
+    def forget(self, key: str):
+        """Drop a published result so the next caller runs the work again"""
+        self.redis.delete(f"{self.namespace}:{key}:result")
+
+class LocalSingleFlight:
+    """In-process stand-in for SingleFlight, for development without Redis"""
+
+    def __init__(self, lease_seconds: int = 1800, notify_interval: float = 5.0):
+        self.lease_seconds = lease_seconds
+        self.notify_interval = notify_interval
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], str],
+        on_wait: Optional[Callable[[float], None]] = None
+    ) -> Tuple[str, bool]:
+        started = time.monotonic()
+
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = {"done": threading.Event(), "result": None, "error": None}
+                    self._flights[key] = flight
+
+            if leader:
+                try:
+                    flight["result"] = fn()
+                    return flight["result"], True
+                except Exception as e:
+                    flight["error"] = e
+                    raise
+                finally:
+                    with self._lock:
+                        self._flights.pop(key, None)
+                    flight["done"].set()
+
+            while not flight["done"].wait(self.notify_interval):
+                waited = time.monotonic() - started
+                if waited > self.lease_seconds:
+                    raise TimeoutError(f"Timed out waiting for shared work on '{key}'")
+                if on_wait:
+                    on_wait(waited)
+
+            if flight["error"] is None:
+                return flight["result"], False
+            # The leader failed, loop around and try to lead ourselves
+
+    def forget(self, key: str):
+        pass
+
+@lru_cache()
+def get_single_flight():
+    """Get the process-wide single-flight coordinator"""
+    settings = get_settings()
+    if settings.SINGLE_FLIGHT_BACKEND == "local":
+        return LocalSingleFlight(lease_seconds=settings.SINGLE_FLIGHT_LEASE_SECONDS)
+    return SingleFlight(get_redis_pool(), lease_seconds=settings.SINGLE_FLIGHT_LEASE_SECONDS)
@@ -0,0 +1,176 @@
+# backend/app/core/websocket_manager.py
+# Push extraction updates to connected browsers
+
+import asyncio
+import json
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import WebSocket, status
+
+from .config import get_settings
+from .logger import get_websockets_logger
+from .redis import get_redis_pool
+
+settings = get_settings()
+logger = get_websockets_logger()
+
+EXTRACTION_CHANNEL_PATTERN = "extraction:*"
+
+class WebSocketManager:
+    """Tracks the open WebSockets of each user connected to this API process"""
+
+    def __init__(self, send_timeout: float = settings.WEBSOCKET_SEND_TIMEOUT_SECONDS):
+        self.connections: Dict[int, Set[WebSocket]] = defaultdict(set)
+        # Users (admins) who receive every extraction's updates
+        self.watch_all: Set[int] = set()
+        self.send_timeout = send_timeout
+        self._closing: Set[asyncio.Task] = set()
+
+    async def connect(self, user_id: int, websocket: WebSocket, watch_all: bool = False):
+        await websocket.accept()
+        self.connections[user_id].add(websocket)
+        if watch_all:
+            self.watch_all.add(user_id)
+        logger.info(f"WebSocket connected for user {user_id} ({len(self.connections[user_id])} open)")
+
+    def disconnect(self, user_id: int, websocket: WebSocket):
+        sockets = self.connections.get(user_id)
+        if sockets is None:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            del self.connections[user_id]
+            self.watch_all.discard(user_id)
+        logger.info(f"WebSocket disconnected for user {user_id}")
+
+    async def _send(self, user_id: int, websocket: WebSocket, message: dict):
+        try:
+            await asyncio.wait_for(websocket.send_json(message), self.send_timeout)
+        except Exception as e:
+            reason = f"no progress in {self.send_timeout}s" if isinstance(e, asyncio.TimeoutError) else e
+            logger.warning(f"Dropping WebSocket for user {user_id}: {reason}")
+            self.disconnect(user_id, websocket)
+            # Tell the client, in the background: a stalled socket may not take the close frame either
+            task = asyncio.create_task(self._close(websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=status.WS_1013_TRY_AGAIN_LATER), self.send_timeout)
+        except Exception:
+            pass
+
+    async def _send_all(self, targets: Iterable[Tuple[int, WebSocket]], message: dict):
+        # Concurrently, so one stalled client delays nobody else by more than the timeout
+        await asyncio.gather(*(self._send(user_id, websocket, message) for user_id, websocket in targets))
+
+    async def send_to_user(self, user_id: int, message: dict):
+        await self._send_all([(user_id, websocket) for websocket in list(self.connections.get(user_id, ()))], message)
+
+    async def dispatch(self, update: dict):
+        """Deliver one update to its owner and to users watching everything"""
+        recipients = set(self.watch_all)
+        if update.get("user_id") is not None:
+            recipients.add(update["user_id"])
+
+        await self._send_all([
+            (user_id, websocket)
+            for user_id in recipients & self.connections.keys()
+            for websocket in list(self.connections[user_id])
+        ], update)
+
+    async def send_extraction_update(
+        self,
+        user_id: int,
+        extraction_id: int,
+        status: str,
+        progress: Optional[int] = None,
+        message: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Publish an update on the extraction's channel rather than writing to
+        sockets directly, so every API process can deliver it to its clients
+        """
+        update = {
+            'type': 'extraction_update',
+            'user_id': user_id,
+            'extraction_id': extraction_id,
+            'status': str(getattr(status, 'value', status)),
+            'progress': progress,
+            'message': message,
+            'error': error
+        }
+        await asyncio.to_thread(
+            get_redis_pool().publish,
+            f'extraction:{extraction_id}',
+            json.dumps(update)
+        )
+
+class ProgressBroadcaster:
+    """
+    The single Redis subscriber of an API process. Pattern-subscribes to every
+    extraction channel and hands messages to the WebSocketManager, keeping only
+    the latest update per extraction within each coalescing window so a burst
+    of progress ticks costs one send per client.
+    """
+
+    def __init__(
+        self,
+        redis,
+        manager: WebSocketManager,
+        coalesce_seconds: float = settings.WEBSOCKET_COALESCE_SECONDS,
+        retry_seconds: float = 5.0
+    ):
+        self.redis = redis
+        self.manager = manager
+        self.coalesce_seconds = coalesce_seconds
+        self.retry_seconds = retry_seconds
+
+    async def run(self):
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Extraction update subscriber failed, retrying in {self.retry_seconds}s: {e}")
+                await asyncio.sleep(self.retry_seconds)
+
+    async def _listen(self):
+        pubsub = self.redis.pubsub()
+        await pubsub.psubscribe(EXTRACTION_CHANNEL_PATTERN)
+        logger.info(f"Subscribed to {EXTRACTION_CHANNEL_PATTERN}")
+
+        pending: Dict[int, dict] = {}
+        loop = asyncio.get_running_loop()
+        flush_at = loop.time() + self.coalesce_seconds
+
+        try:
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=max(flush_at - loop.time(), 0)
+                )
+                if message and message["type"] == "pmessage":
+                    try:
+                        update = json.loads(message["data"])
+                        pending[update["extraction_id"]] = update
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Ignoring malformed message on {message['channel']}")
+
+                if loop.time() >= flush_at:
+                    updates, pending = pending, {}
+                    for update in updates.values():
+                        await self.manager.dispatch(update)
+                    flush_at = loop.time() + self.coalesce_seconds
+        finally:
+            await pubsub.aclose()
+
+@lru_cache()
+def get_websocket_manager() -> WebSocketManager:
+    """Get the process-wide WebSocket manager"""
+    return WebSocketManager()
@@ -1,27 +1,92 @@
-import os
-from datetime import datetime, timedelta
-from typing import Generator
-from zoneinfo import ZoneInfo
+import itertools
+from pathlib import Path
+from typing import AsyncGenerator, Generator
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
-from app.db.models import Base, Extraction
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.SQLITE_DATABASE_URL,
-    connect_args=settings.DB_CONNECT_ARGS,
-    pool_size=20,
-    max_overflow=20,
-    pool_timeout=60
-)
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool and connection arguments for the backend a URL points at"""
+    backend = make_url(url).get_backend_name()
+
+    if backend == "sqlite":
+        options = {"connect_args": settings.DB_CONNECT_ARGS}
+        if not is_async:
+            options.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT
+            )
+        return options
+
+    if backend == "postgresql":
+        timeout = settings.DB_STATEMENT_TIMEOUT_MS
+        if is_async:
+            connect_args = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            connect_args = {"options": f"-c statement_timeout={timeout}"}
+    else:
+        connect_args = {}
+
+    return {
+        "connect_args": connect_args,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request path: FastAPI handlers use the async engine so queries never block
+# the event loop. Celery tasks and migrations keep the sync engine above.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    **engine_options(settings.async_database_url, is_async=True)
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read-only listing endpoints spread over replicas when any are configured
+read_engines = [
+    create_async_engine(url, **engine_options(url, is_async=True))
+    for url in settings.async_read_replica_urls
+]
+_read_sessions = itertools.cycle([
+    async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+    for read_engine in read_engines
+] or [AsyncSessionLocal])
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside the single writer, and the busy timeout
+    makes concurrent writers wait for the lock instead of failing with
+    'database is locked'.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.close()
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+for _async_engine in [async_engine, *read_engines]:
+    if _async_engine.dialect.name == "sqlite":
+        event.listen(_async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
@@ -29,6 +94,15 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the next read replica, or the primary when there are none"""
+    async with next(_read_sessions)() as db:
+        yield db
+
 @contextmanager
 def get_db_context():
     """Context manager for database sessions"""
@@ -38,6 +112,26 @@ def get_db_context():
     finally:
         db.close()
 
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Last revision whose schema create_all produced before migrations existed
+PRE_MIGRATIONS_REVISION = "0001"
+
+def run_migrations(revision: str = "head") -> None:
+    """Upgrade the database schema with Alembic"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+
+    tables = inspect(engine).get_table_names()
+    if "extractions" in tables and "alembic_version" not in tables:
+        # Database was built by Base.metadata.create_all, adopt it as the baseline
+        command.stamp(config, PRE_MIGRATIONS_REVISION)
+
+    command.upgrade(config, revision)
+
 def init_db() -> None:
     from app.core.logger import get_app_logger
 
@@ -45,39 +139,8 @@ def init_db() -> None:
 
     logger.info("Initializing database...")
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        run_migrations()
+        logger.info("Database schema is up to date")
     except Exception as e:
-        logger.critical(f"Error creating database tables: {str(e)}")
+        logger.critical(f"Error migrating database: {str(e)}")
         raise
-
-async def cleanup_old_extractions() -> None:
-    """
-    Clean up tasks include deleting local files older than 'days_limit'
-    and update the database records
-    """
-
-    cleanup_date = datetime.now(ZoneInfo('UCT')) - timedelta(days=20)
-    db = get_db()
-
-    try:
-        old_extractions = db.query(Extraction).filter(
-            Extraction.extraction_datetime < cleanup_date,
-            Extraction.status == "completed",
-            Extraction.file_path.isnot(None)
-        ).all()
-
-        for extraction in old_extractions:
-
-            if extraction.file_path and os.path.exists(extraction.file_path):
-                try:
-                    os.remove(extraction.file_path)
-                except OSError:
-                    print(f"Failed to delete file: {extraction.file_path}")
-
-            extraction.status = "expired"
-            extraction.file_path = None
-
-        db.commit()
-    finally:
-        db.close()
@@ -0,0 +1,58 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("hashed_password", sa.String()),
+        sa.Column("auth_token", sa.String(), nullable=True),
+        sa.Column("active_extractions", sa.Integer()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_name", "users", ["name"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "extractions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("root_url", sa.String(), nullable=False),
+        sa.Column("video_title", sa.String(), nullable=True),
+        sa.Column("start_time", sa.String(), nullable=False),
+        sa.Column("end_time", sa.String(), nullable=False),
+        sa.Column("notes", sa.Text()),
+        sa.Column("summary", sa.Text()),
+        sa.Column("status", sa.String()),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("progress", sa.Integer()),
+        sa.Column("retry_count", sa.Integer()),
+        sa.Column("process_reference", sa.String(), nullable=True),
+        sa.Column("extraction_datetime", sa.DateTime()),
+        sa.Column("last_updated", sa.DateTime()),
+        sa.Column("file_path", sa.String(), nullable=True),
+        sa.Column("temp_files", sa.JSON()),
+        sa.Column("captions_generated", sa.Boolean()),
+        sa.Column("creator_id", sa.Integer(), sa.ForeignKey("users.id")),
+    )
+    op.create_index("ix_extractions_id", "extractions", ["id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_extractions_id", table_name="extractions")
+    op.drop_table("extractions")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_name", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
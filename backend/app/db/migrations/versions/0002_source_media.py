@@ -0,0 +1,33 @@
+"""source media cache
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Databases built with create_all before migrations existed may already have it
+    if "source_media" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "source_media",
+        sa.Column("episode_id", sa.String(), primary_key=True),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("last_accessed", sa.DateTime()),
+        sa.Column("hits", sa.Integer()),
+    )
+    op.create_index("ix_source_media_last_accessed", "source_media", ["last_accessed"])
+
+def downgrade() -> None:
+    op.drop_index("ix_source_media_last_accessed", table_name="source_media")
+    op.drop_table("source_media")
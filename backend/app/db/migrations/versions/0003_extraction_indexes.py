@@ -0,0 +1,24 @@
+"""composite indexes for extraction access patterns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index("ix_extractions_creator_datetime", "extractions", ["creator_id", "extraction_datetime", "id"])
+    op.create_index("ix_extractions_datetime_id", "extractions", ["extraction_datetime", "id"])
+    op.create_index("ix_extractions_status_datetime", "extractions", ["status", "extraction_datetime"])
+    op.create_index("ix_extractions_creator_status", "extractions", ["creator_id", "status"])
+
+def downgrade() -> None:
+    op.drop_index("ix_extractions_creator_status", table_name="extractions")
+    op.drop_index("ix_extractions_status_datetime", table_name="extractions")
+    op.drop_index("ix_extractions_datetime_id", table_name="extractions")
+    op.drop_index("ix_extractions_creator_datetime", table_name="extractions")
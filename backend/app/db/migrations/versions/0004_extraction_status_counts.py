@@ -0,0 +1,27 @@
+"""materialized extraction counts per status
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "extraction_status_counts",
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "INSERT INTO extraction_status_counts (status, count) "
+        "SELECT COALESCE(status, 'pending'), COUNT(*) FROM extractions GROUP BY COALESCE(status, 'pending')"
+    )
+
+def downgrade() -> None:
+    op.drop_table("extraction_status_counts")
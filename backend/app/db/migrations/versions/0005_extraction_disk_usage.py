@@ -0,0 +1,29 @@
+"""clip size and last access for disk budget eviction
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("extractions", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("extractions", sa.Column("last_accessed", sa.DateTime(), nullable=True))
+    # Existing clips start out as old as they are; sizes are filled in by the budget sweep
+    op.execute(
+        "UPDATE extractions SET last_accessed = extraction_datetime "
+        "WHERE status = 'completed'"
+    )
+    op.create_index("ix_extractions_status_last_accessed", "extractions", ["status", "last_accessed", "id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_extractions_status_last_accessed", table_name="extractions")
+    with op.batch_alter_table("extractions") as batch_op:
+        batch_op.drop_column("last_accessed")
+        batch_op.drop_column("size_bytes")
@@ -0,0 +1,31 @@
+"""seed a count row for every extraction status
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# ExtractionStatus values as of this revision
+STATUSES = ("pending", "waiting", "downloading", "processing", "completed", "failed", "expired")
+
+def upgrade() -> None:
+    # With every row present, the flush listener's increments never race to insert one
+    for status in STATUSES:
+        op.get_bind().execute(
+            sa.text(
+                "INSERT INTO extraction_status_counts (status, count) SELECT :status, 0 "
+                "WHERE NOT EXISTS (SELECT 1 FROM extraction_status_counts WHERE status = :status)"
+            ),
+            {"status": status}
+        )
+
+def downgrade() -> None:
+    # Zero rows are indistinguishable from seeded ones and harmless to keep
+    op.execute("DELETE FROM extraction_status_counts WHERE count = 0")
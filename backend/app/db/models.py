@@ -1,22 +1,32 @@
 # backend/app/db/models.py
+from collections import Counter
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 from zoneinfo import ZoneInfo
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, Index, Text, JSON, event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, column_property, relationship, synonym
 
 Base = declarative_base()
 
 class ExtractionStatus(str, Enum):
     PENDING = "pending"
+    WAITING = "waiting"
     DOWNLOADING = "downloading"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
     EXPIRED = "expired"
 
+# Statuses that will not change again, so their live Redis state is never needed
+TERMINAL_STATUSES = (ExtractionStatus.COMPLETED, ExtractionStatus.FAILED, ExtractionStatus.EXPIRED)
+
+def utcnow() -> datetime:
+    """Naive UTC, as the DateTime columns store it; asyncpg rejects aware values for them"""
+    return datetime.now(ZoneInfo('UTC')).replace(tzinfo=None)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -29,29 +39,45 @@ class User(Base):
 
 class Extraction(Base):
     __tablename__ = "extractions"
+    __table_args__ = (
+        # Per-user listings and keyset pagination in GET /videos, ownership lookups
+        Index("ix_extractions_creator_datetime", "creator_id", "extraction_datetime", "id"),
+        # Admin listing across all users
+        Index("ix_extractions_datetime_id", "extraction_datetime", "id"),
+        # Status counts and the retention scan (status + age)
+        Index("ix_extractions_status_datetime", "status", "extraction_datetime"),
+        # Per-user status counts on the dashboard
+        Index("ix_extractions_creator_status", "creator_id", "status"),
+        # Least recently accessed clips first when the disk budget evicts
+        Index("ix_extractions_status_last_accessed", "status", "last_accessed", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     root_url = Column(String, nullable=False)
+    youtube_url = synonym("root_url")
     video_title = Column(String, nullable=True)
     start_time = Column(String, nullable=False)
     end_time = Column(String, nullable=False)
-    notes = Column(Text(300))
-    summary = Column(Text(300))
+    notes = Column(Text)
+    summary = Column(Text)
 
     # Enhanced status tracking
-    status = Column(String, default=ExtractionStatus.PENDING)
+    # active_history loads the previous value on change so status counts stay exact
+    status = column_property(Column(String, default=ExtractionStatus.PENDING), active_history=True)
     error_message = Column(Text, nullable=True)
     progress = Column(Integer, default=0)
     retry_count = Column(Integer, default=0)
     process_reference = Column(String, nullable=True)
 
     # Metadata
-    extraction_datetime = Column(DateTime, default=datetime.now(ZoneInfo('UTC')))
-    last_updated = Column(DateTime, default=datetime.now(ZoneInfo('UTC')), onupdate=datetime.now(ZoneInfo('UTC')))
+    extraction_datetime = Column(DateTime, default=utcnow)
+    last_updated = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     # File management
     file_path = Column(String, nullable=True)
     temp_files = Column(JSON, default=list)
+    size_bytes = Column(BigInteger, nullable=True)  # of the stored clip, once completed
+    last_accessed = Column(DateTime, nullable=True)  # last time the clip was served
 
     # Settings and relations
     captions_generated = Column(Boolean, default=False)
@@ -65,7 +91,7 @@ class Extraction(Base):
             self.error_message = error
         if progress is not None:
             self.progress = min(100, max(0, progress))
-        self.last_updated = datetime.now(ZoneInfo('UTC'))
+        self.last_updated = utcnow()
 
     def to_dict(self):
         """Convert extraction to dict for WebSocket messages"""
@@ -82,3 +108,70 @@ class Extraction(Base):
             "extraction_datetime": self.extraction_datetime.isoformat(),
             "last_updated": self.last_updated.isoformat()
         }
+
+class SourceMedia(Base):
+    """Downloaded episode media shared by every extraction of that episode"""
+    __tablename__ = "source_media"
+
+    episode_id = Column(String, primary_key=True)
+    file_path = Column(String, nullable=False)
+    size_bytes = Column(BigInteger, default=0)
+    created_at = Column(DateTime, default=utcnow)
+    last_accessed = Column(DateTime, default=utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+class ExtractionStatusCount(Base):
+    """Materialized number of extractions per status, kept current on every flush"""
+    __tablename__ = "extraction_status_counts"
+
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _status_key(status) -> str:
+    if status is None:
+        return ExtractionStatus.PENDING.value
+    return status.value if isinstance(status, Enum) else str(status)
+
+@event.listens_for(Session, "before_flush")
+def _track_status_transitions(session, flush_context, instances):
+    """Apply status inserts, transitions and deletes to extraction_status_counts"""
+    deltas = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, Extraction):
+            deltas[_status_key(obj.status)] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Extraction):
+            history = inspect(obj).attrs.status.history
+            deltas[_status_key(history.deleted[0] if history.deleted else obj.status)] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Extraction) and obj not in session.deleted:
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted:
+                old, new = _status_key(history.deleted[0]), _status_key(history.added[0])
+                if old != new:
+                    deltas[old] -= 1
+                    deltas[new] += 1
+
+    table = ExtractionStatusCount.__table__
+    dialect = session.get_bind().dialect.name
+    for status, delta in deltas.items():
+        if not delta:
+            continue
+        if dialect in _UPSERTS:
+            # Concurrent first flushes of a status cannot both insert its row
+            insert = _UPSERTS[dialect](table).values(status=status, count=delta)
+            session.execute(insert.on_conflict_do_update(
+                index_elements=[table.c.status],
+                set_={"count": table.c.count + delta}
+            ))
+            continue
+        result = session.execute(
+            table.update().where(table.c.status == status).values(count=table.c.count + delta)
+        )
+        if result.rowcount == 0:
+            session.execute(table.insert().values(status=status, count=delta))
@@ -0,0 +1,123 @@
+# backend/app/db/plans.py
+# Query-plan check: the hot extraction queries must be served by an index
+
+import argparse
+import os
+import tempfile
+from datetime import timedelta
+from typing import Dict, List, Tuple
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import and_, create_engine, func, or_, select, text
+from sqlalchemy.dialects import sqlite
+
+from app.db.base import MIGRATIONS_DIR
+from app.db.models import Extraction, ExtractionStatus, utcnow
+
+def hot_queries() -> Dict[str, Tuple[object, str]]:
+    """Each hot query, as its caller builds it, with the index it must use"""
+    now = utcnow()
+    cursor = or_(
+        Extraction.extraction_datetime < now,
+        and_(Extraction.extraction_datetime == now, Extraction.id < 1000)
+    )
+    newest_first = (Extraction.extraction_datetime.desc(), Extraction.id.desc())
+
+    return {
+        # GET /videos for a user, first page and a later one
+        "user listing": (
+            select(Extraction).where(Extraction.creator_id == 1).order_by(*newest_first).limit(101),
+            "ix_extractions_creator_datetime"
+        ),
+        "user listing, next page": (
+            select(Extraction).where(Extraction.creator_id == 1, cursor).order_by(*newest_first).limit(101),
+            "ix_extractions_creator_datetime"
+        ),
+        # GET /videos for the admin, across users
+        "admin listing": (
+            select(Extraction).order_by(*newest_first).limit(101),
+            "ix_extractions_datetime_id"
+        ),
+        "admin listing, next page": (
+            select(Extraction).where(cursor).order_by(*newest_first).limit(101),
+            "ix_extractions_datetime_id"
+        ),
+        # GET /dashboard/stats, the caller's own counts
+        "user status counts": (
+            select(Extraction.status, func.count(Extraction.id))
+            .where(Extraction.creator_id == 1)
+            .group_by(Extraction.status),
+            "ix_extractions_creator_status"
+        ),
+        # retention.expired_batch
+        "retention batch": (
+            select(Extraction).where(
+                Extraction.status == ExtractionStatus.COMPLETED,
+                Extraction.file_path.isnot(None),
+                Extraction.extraction_datetime < now - timedelta(days=7),
+                or_(
+                    Extraction.extraction_datetime > now - timedelta(days=30),
+                    and_(Extraction.extraction_datetime == now - timedelta(days=30), Extraction.id > 1000)
+                )
+            ).order_by(Extraction.extraction_datetime, Extraction.id).limit(500),
+            "ix_extractions_status_datetime"
+        ),
+        # DiskBudget._evict
+        "disk budget eviction": (
+            select(Extraction).where(
+                Extraction.status == ExtractionStatus.COMPLETED,
+                Extraction.file_path.isnot(None),
+                Extraction.size_bytes.isnot(None)
+            ).order_by(Extraction.last_accessed.asc(), Extraction.id.asc()).limit(100),
+            "ix_extractions_status_last_accessed"
+        )
+    }
+
+def plan(connection, statement) -> List[str]:
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+def check_plans(verbose: bool = False) -> bool:
+    """
+    Migrate a scratch SQLite database to head and check that every hot query
+    searches its index instead of scanning the table or sorting its result.
+    """
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    ok = True
+    try:
+        with engine.begin() as connection:
+            config = Config()
+            config.set_main_option("script_location", str(MIGRATIONS_DIR))
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+
+        with engine.connect() as connection:
+            for name, (statement, index) in hot_queries().items():
+                steps = plan(connection, statement)
+                problems = []
+                if not any(index in step for step in steps):
+                    problems.append(f"does not use {index}")
+                if any(step.startswith("SCAN extractions") and "INDEX" not in step for step in steps):
+                    problems.append("scans the table")
+                if any("TEMP B-TREE" in step for step in steps):
+                    problems.append("sorts its result")
+
+                ok = ok and not problems
+                print(f"{'FAIL' if problems else 'ok  '} {name}{': ' + ', '.join(problems) if problems else ''}")
+                if verbose or problems:
+                    for step in steps:
+                        print(f"       {step}")
+    finally:
+        engine.dispose()
+        os.remove(path)
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the hot extraction queries use their indexes")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failing ones")
+    args = parser.parse_args()
+
+    raise SystemExit(0 if check_plans(args.verbose) else 1)
@@ -1,11 +1,14 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.api import auth, protected
+from app.api import auth, files, protected
 from app.middleware import setup_middleware
 from app.core.config import get_settings
-from app.db.base import init_db
+from app.core.redis import get_redis
+from app.core.websocket_manager import ProgressBroadcaster, get_websocket_manager
+from app.db.base import async_engine, init_db, read_engines
 
 settings = get_settings()
 
@@ -15,9 +18,23 @@ async def lifespan(app: FastAPI):
     # Startup
     init_db()
 
+    # One Redis subscriber per process fans extraction updates out to WebSockets
+    app.state.redis = await get_redis()
+    broadcaster = asyncio.create_task(
+        ProgressBroadcaster(app.state.redis, get_websocket_manager()).run()
+    )
+
     yield
 
     # Cleanup
+    broadcaster.cancel()
+    try:
+        await broadcaster
+    except asyncio.CancelledError:
+        pass
+    await async_engine.dispose()
+    for read_engine in read_engines:
+        await read_engine.dispose()
     if hasattr(app.state, 'redis'):
         await app.state.redis.close()
 
@@ -26,3 +43,4 @@ setup_middleware(app)
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(protected.router, prefix="/api", tags=["access"])
+app.include_router(files.router, prefix="/api", tags=["files"])
@@ -14,6 +14,7 @@ def setup_middleware(app: FastAPI):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Content-Range", "Accept-Ranges", "ETag"],
     )
 
     app.middleware("http")(authenticate)
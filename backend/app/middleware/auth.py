@@ -1,3 +1,6 @@
+import re
+from typing import List
+
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from ..core.logger import get_auth_logger
@@ -6,15 +9,22 @@ from ..core.config import get_settings
 settings = get_settings()
 auth_logger = get_auth_logger()
 
+def compile_route_matcher(routes: List[str]) -> re.Pattern:
+    """One regex matching any path that ends with a protected route"""
+    if not routes:
+        return re.compile(r"(?!)")
+    return re.compile("(?:" + "|".join(re.escape(route) for route in routes) + ")$")
+
 # Define protected routes at module level
 PROTECTED_ROUTES = settings.PROTECTED_ROUTES
+PROTECTED_ROUTE_MATCHER = compile_route_matcher(PROTECTED_ROUTES)
 
 async def authenticate(request: Request, call_next):
     """Authentication middleware for protected routes"""
     if request.method == "OPTIONS":
         return await call_next(request)
 
-    if not any(request.url.path.endswith(route) for route in PROTECTED_ROUTES):
+    if not PROTECTED_ROUTE_MATCHER.search(request.url.path):
         return await call_next(request)
 
     try:
@@ -19,11 +19,8 @@ async def log_request(request: Request):
             body = await request.body()
             if body:
                 body_str = body.decode()
+                # Starlette hands the cached body on to the handler
                 request_info["body"] = json.loads(body_str)
-                # Recreate body stream for downstream handlers
-                async def receive():
-                    return {"type": "http.request", "body": body}
-                request._receive = receive
         except json.JSONDecodeError:
             request_info["body"] = "Invalid JSON"
 
@@ -0,0 +1,3 @@
+# backend/app/tasks/__init__.py
+# Loaded with any task module, so the periodic tasks register wherever workers or beat start
+from . import retention, scheduler  # noqa: F401
@@ -1,14 +1,52 @@
 # backend/app/tasks/extraction.py
 
 import json
+import os
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
 from celery import Task
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
+from app.core import metrics
 from app.core.celery import celery_app
 from app.core.redis import get_redis_pool
+from app.core.singleflight import get_single_flight
+from app.core.logger import get_videos_logger
 from app.db.base import get_db_context
+from app.db.writer import get_status_writer
+from app.db.models import Extraction
+from app.video.budget import get_disk_budget
+from app.video.cache import SourceCache
+from app.video.clipping import cut_clip, cut_clips
+from app.video.probe import get_media_metadata
+from app.video.pool import close_worker_pool, get_worker_pool, init_worker_pool
 from app.video.spotify import SpotifyWorker
+from app.video.storage import store_clip
+from app.video.workspace import (
+    METRICS_NAMESPACE as SCRATCH_METRICS_NAMESPACE,
+    ScratchWorkspace,
+    has_scratch_space,
+    sweep_orphans
+)
 from app.core.config import get_settings
+from app.tasks.scheduler import DOWNLOAD_QUEUE, FFMPEG_QUEUE, get_scheduler, record_enqueued, record_started
 
 settings = get_settings()
+logger = get_videos_logger()
+
+def time_to_seconds(time_str: str) -> int:
+    """Convert HH:MM:SS or MM:SS to seconds"""
+    parts = time_str.split(':')
+    if len(parts) == 2:
+        return int(parts[0]) * 60 + int(parts[1])
+    return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+def event_stream_key(user_id: int = None) -> str:
+    """Redis stream of extraction updates for one user, or for everyone"""
+    return f'extraction_events:{user_id}' if user_id is not None else 'extraction_events'
 
 class ExtractionTask(Task):
     """Base task for extractions with progress tracking"""
@@ -20,98 +58,402 @@ class ExtractionTask(Task):
             self._redis = get_redis_pool()
         return self._redis
 
-    def update_progress(self, extraction_id: int, status: str, progress: int = None, message: str = None, error: str = None):
+    def update_progress(
+        self,
+        extraction_id: int,
+        status: str,
+        progress: int = None,
+        message: str = None,
+        error: str = None,
+        user_id: int = None,
+        speed: float = None,
+        eta_seconds: float = None
+    ):
         """Update extraction progress in Redis and notify clients"""
         update = {
             'type': 'extraction_update',
+            'user_id': user_id,
             'extraction_id': extraction_id,
             'status': status,
             'progress': progress,
             'message': message,
-            'error': error
+            'error': error,
+            'speed': speed,
+            'eta_seconds': eta_seconds
         }
-        
+
+        payload = json.dumps(update)
+        pipe = self.redis.pipeline()
+
         # Store current state in Redis
-        self.redis.set(
+        pipe.set(
             f'extraction:{extraction_id}:status',
-            json.dumps(update),
+            payload,
             ex=3600  # expire after 1 hour
         )
-        
+
         # Publish update to channel
-        self.redis.publish(
-            f'extraction:{extraction_id}',
-            json.dumps(update)
+        pipe.publish(f'extraction:{extraction_id}', payload)
+
+        # Append to the replayable streams behind GET /videos/events
+        for stream in {event_stream_key(), event_stream_key(user_id)}:
+            pipe.xadd(stream, {'data': payload}, maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True)
+
+        pipe.execute()
+
+        # Persist progress through the batching writer, not a commit per tick
+        if progress is not None:
+            get_status_writer().submit(extraction_id, progress)
+
+@worker_init.connect
+def sweep_scratch(**kwargs):
+    """Remove workspaces left behind by worker processes that were killed"""
+    sweep_orphans()
+
+@worker_process_init.connect
+def init_spotify_pool(**kwargs):
+    """Authenticate and warm the SpotifyWorker pool once per worker process"""
+    init_worker_pool()
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Release pooled workers and write out any buffered progress"""
+    close_worker_pool()
+    get_status_writer().close()
+
+def validate_clip_range(start_seconds: int, end_seconds: int, media_duration: float = None):
+    """Reject clip ranges the source media cannot satisfy"""
+    if start_seconds < 0 or end_seconds <= start_seconds:
+        raise ValueError(f"Invalid clip range {start_seconds}s-{end_seconds}s")
+    if media_duration is not None and end_seconds > media_duration:
+        raise ValueError(
+            f"Clip ends at {end_seconds}s but the episode is only {int(media_duration)}s long"
+        )
+
+def stage_reporter(task: ExtractionTask, extraction_id: int, user_id: int, status: str, start: int, end: int, label: str):
+    """Map an ffmpeg run's progress onto the start..end slice of the overall bar"""
+    def report(fraction: float, speed: float, eta: float):
+        message = f"{label} {int(fraction * 100)}%"
+        if speed:
+            message += f" at {speed:.1f}x"
+        if eta is not None:
+            message += f", {int(eta)}s left"
+        task.update_progress(
+            extraction_id,
+            status,
+            start + int((end - start) * fraction),
+            message,
+            user_id=user_id,
+            speed=speed,
+            eta_seconds=eta
+        )
+    return report
+
+def fetch_source(task: ExtractionTask, db, downloader: SpotifyWorker, extraction: Extraction, start_seconds: int, end_seconds: int):
+    """
+    Get media covering start_seconds..end_seconds, from the source cache, a
+    partial fetch or a shared full download. Returns the media path, the
+    episode time its first frame maps to and how it was obtained.
+    """
+    extraction_id = extraction.id
+    source_cache = SourceCache(downloader.dest_dir, settings.SOURCE_CACHE_MAX_BYTES)
+    episode_id = downloader.get_episode_id(extraction.youtube_url)
+
+    video_path = source_cache.lookup(db, episode_id)
+    if video_path:
+        return video_path, 0, "cached"
+
+    if settings.PARTIAL_FETCH_ENABLED:
+        window = downloader._download_spotify_window(
+            url=extraction.youtube_url,
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+            padding_seconds=settings.PARTIAL_FETCH_PADDING_SECONDS,
+            on_progress=stage_reporter(
+                task, extraction_id, extraction.creator_id, "downloading", 25, 75, "Downloading"
+            )
+        )
+        if window:
+            video_path, window_start = window
+            return video_path, window_start, "partial"
+
+    def download_source() -> str:
+        # A previous leader may have finished since our lookup
+        cached = source_cache.lookup(db, episode_id)
+        if cached:
+            return str(cached)
+        downloaded = downloader._download_spotify_content(url=extraction.youtube_url)
+        return str(source_cache.store(db, episode_id, downloaded))
+
+    def report_waiting(waited: float):
+        task.update_progress(
+            extraction_id,
+            "waiting",
+            25,
+            f"Waiting for shared download ({int(waited)}s)",
+            user_id=extraction.creator_id
         )
 
+    shared_path, leader = get_single_flight().do(
+        f"source:{episode_id}",
+        download_source,
+        on_wait=report_waiting
+    )
+    return Path(shared_path), 0, "full" if leader else "shared"
+
+def defer_if_scratch_full(task: ExtractionTask, queue: str):
+    """Put the job back on its queue instead of starting it on a nearly full scratch disk"""
+    if has_scratch_space():
+        return
+    logger.warning(f"Scratch space low, deferring {task.name} for {settings.SCRATCH_RETRY_SECONDS}s")
+    metrics.incr(SCRATCH_METRICS_NAMESPACE, "deferrals")
+    record_enqueued(queue)
+    raise task.retry(countdown=settings.SCRATCH_RETRY_SECONDS, max_retries=None, queue=queue)
+
+def clip_ranges(extractions: List[Extraction]) -> Dict[int, Tuple[int, int]]:
+    return {
+        extraction.id: (time_to_seconds(extraction.start_time), time_to_seconds(extraction.end_time))
+        for extraction in extractions
+    }
+
+def notify(task: ExtractionTask, extractions: List[Extraction], user_id: int, status: str, progress: int, message: str = None, error: str = None):
+    for extraction in extractions:
+        task.update_progress(extraction.id, status, progress, message, error=error, user_id=user_id)
+
+def reject_out_of_range(task: ExtractionTask, db, extractions: List[Extraction], ranges: dict, user_id: int, media_duration: float = None) -> List[Extraction]:
+    """Fail the rows the media cannot satisfy and return the rest"""
+    valid = []
+    for extraction in extractions:
+        try:
+            validate_clip_range(*ranges[extraction.id], media_duration)
+            valid.append(extraction)
+        except ValueError as e:
+            extraction.status = "failed"
+            extraction.error_message = str(e)
+            notify(task, [extraction], user_id, "failed", 0, error=str(e))
+    db.commit()
+    return valid
+
+def fail_extractions(task: ExtractionTask, db, extractions: List[Extraction], user_id: int, msg: str):
+    logger.error(msg)
+    unfinished = [e for e in extractions if e.status not in ("completed", "failed")]
+    for extraction in unfinished:
+        extraction.status = "failed"
+        extraction.error_message = msg
+    db.commit()
+    notify(task, unfinished, user_id, "failed", 0, error=msg)
+
 @celery_app.task(bind=True, base=ExtractionTask)
-def process_extraction(self, user_id: int, extraction_id: int):
-    """Process extraction as Celery task"""
+def download_extractions(self, user_id: int, extraction_ids: List[int], enqueued_at: float = None):
+    """
+    Download stage: fetch the source shared by one or more extractions once,
+    then hand the clips to the ffmpeg queue
+    """
+    record_started(DOWNLOAD_QUEUE, enqueued_at)
+    defer_if_scratch_full(self, DOWNLOAD_QUEUE)
+
+    handed_off = False
+    partial_path = None
     try:
         with get_db_context() as db:
-            extraction = db.query(Extraction).get(extraction_id)
-            if not extraction:
+            extractions = db.query(Extraction).filter(Extraction.id.in_(extraction_ids)).order_by(Extraction.id).all()
+            if not extractions:
                 return
 
             try:
-                self.update_progress(extraction_id, "processing", 0, "Starting extraction...")
-                downloader = SpotifyWorker(settings.SPOTIFY_COOKIES_FILE)
+                notify(self, extractions, user_id, "processing", 0, "Starting extraction...")
+                ranges = clip_ranges(extractions)
 
-                # Download phase
-                self.update_progress(extraction_id, "downloading", 25, "Downloading content")
-                video_path = downloader._download_spotify_content(url=extraction.youtube_url)
-                extraction.file_path = str(video_path)
-                db.commit()
+                with get_worker_pool().checkout() as downloader, \
+                        ScratchWorkspace(f"download-{extraction_ids[0]}") as scratch, \
+                        downloader.scratch(scratch):
+                    # Fail fast on impossible ranges, before anything is downloaded
+                    valid = reject_out_of_range(
+                        self, db, extractions, ranges, user_id,
+                        downloader.get_duration_seconds(extractions[0].youtube_url)
+                    )
+                    if not valid:
+                        return
 
-                # Processing phase
-                self.update_progress(extraction_id, "processing", 75, "Processing content...")
-                start_seconds = time_to_seconds(extraction.start_time)
-                end_seconds = time_to_seconds(extraction.end_time)
-                duration = end_seconds - start_seconds
-
-                output_file = process_video(
-                    video_path,
-                    start_seconds,
-                    duration,
-                    extraction_id
+                    # Download phase, once for the span covering every clip
+                    notify(self, valid, user_id, "downloading", 25, "Downloading content")
+                    fetch_started = time.monotonic()
+                    video_path, window_start, fetch_mode = fetch_source(
+                        self,
+                        db,
+                        downloader,
+                        valid[0],
+                        min(ranges[e.id][0] for e in valid),
+                        max(ranges[e.id][1] for e in valid)
+                    )
+                    if fetch_mode == "partial":
+                        partial_path = video_path
+
+                    logger.info(
+                        f"Extractions {[e.id for e in valid]}: {fetch_mode} fetch of "
+                        f"{os.path.getsize(video_path)} bytes in {time.monotonic() - fetch_started:.2f}s"
+                    )
+                    for extraction in valid:
+                        extraction.file_path = str(video_path)
+                    db.commit()
+
+                    if fetch_mode == "full":
+                        # Evict only once these extractions pin the new entry
+                        SourceCache(downloader.dest_dir, settings.SOURCE_CACHE_MAX_BYTES).evict(db)
+
+
+                notify(self, valid, user_id, "processing", 75, "Waiting for ffmpeg worker...")
+                cut_extractions.apply_async(
+                    kwargs={
+                        "user_id": user_id,
+                        "extraction_ids": [e.id for e in valid],
+                        "source_path": str(video_path),
+                        "source_host": socket.gethostname(),
+                        "window_start": window_start,
+                        "fetch_mode": fetch_mode,
+                        "slots": len(extraction_ids),
+                        "enqueued_at": time.time()
+                    },
+                    queue=FFMPEG_QUEUE
                 )
+                record_enqueued(FFMPEG_QUEUE)
+                handed_off = True
 
-                extraction.status = "completed"
-                extraction.file_path = str(output_file)
+            except Exception as e:
+                fail_extractions(self, db, extractions, user_id, f"Extraction failed: {str(e)}")
+                raise
+    finally:
+        # Once handed off, the ffmpeg stage owns the user's slots
+        if not handed_off:
+            if partial_path and os.path.exists(partial_path):
+                os.remove(partial_path)
+            get_scheduler().release(user_id, len(extraction_ids))
+
+@celery_app.task(bind=True, base=ExtractionTask)
+def cut_extractions(
+    self,
+    user_id: int,
+    extraction_ids: List[int],
+    source_path: str,
+    window_start: int,
+    fetch_mode: str,
+    slots: int,
+    enqueued_at: float = None,
+    source_host: str = None
+):
+    """ffmpeg stage: cut every clip of a downloaded source, in one pass where possible"""
+    record_started(FFMPEG_QUEUE, enqueued_at)
+    defer_if_scratch_full(self, FFMPEG_QUEUE)
+
+    try:
+        with get_db_context() as db, ScratchWorkspace(f"cut-{extraction_ids[0]}") as scratch:
+            extractions = db.query(Extraction).filter(Extraction.id.in_(extraction_ids)).order_by(Extraction.id).all()
+            if not extractions:
+                return
+
+            try:
+                ranges = clip_ranges(extractions)
+                video_path = Path(source_path)
+                if not video_path.exists():
+                    raise FileNotFoundError(
+                        f"Source {source_path} from {source_host} is not visible on {socket.gethostname()}, "
+                        f"the extractions directory must be shared by every worker"
+                    )
+
+                # Whole cached sources carry probed metadata in a sidecar
+                metadata = None
+                if fetch_mode != "partial":
+                    metadata = get_media_metadata(video_path)
+                    extractions = reject_out_of_range(self, db, extractions, ranges, user_id, metadata["duration"])
+                    if not extractions:
+                        return
+
+                # Processing phase
+                notify(self, extractions, user_id, "processing", 75, "Processing content...")
+                reporters = [
+                    stage_reporter(self, e.id, user_id, "processing", 75, 99, "Processing")
+                    for e in extractions
+                ]
+
+                if len(extractions) == 1:
+                    start_seconds, end_seconds = ranges[extractions[0].id]
+                    output_files = [process_video(
+                        video_path,
+                        start_seconds - window_start,
+                        end_seconds - start_seconds,
+                        extractions[0].id,
+                        output_dir=scratch,
+                        metadata=metadata,
+                        on_progress=reporters[0],
+                        scratch_dir=scratch
+                    )]
+                else:
+                    def report(fraction: float, speed: float, eta: float):
+                        for reporter in reporters:
+                            reporter(fraction, speed, eta)
+
+                    # A single pass with one output per clip
+                    clips = [
+                        (
+                            clip_output_path(scratch, e.id),
+                            ranges[e.id][0] - window_start,
+                            ranges[e.id][1] - ranges[e.id][0]
+                        )
+                        for e in extractions
+                    ]
+                    try:
+                        output_files = cut_clips(
+                            video_path, clips, on_progress=report, metadata=metadata, scratch_dir=scratch
+                        )
+                    except Exception as e:
+                        raise Exception(f"Video processing failed: {str(e)}")
+                    output_files = [store_clip(output_file) for output_file in output_files]
+
+                budget = get_disk_budget()
+                for extraction, output_file in zip(extractions, output_files):
+                    extraction.status = "completed"
+                    extraction.file_path = output_file
+                    budget.record_size(extraction)
                 db.commit()
 
-                self.update_progress(extraction_id, "completed", 100, "Extraction complete!")
+                notify(self, extractions, user_id, "completed", 100, "Extraction complete!")
+                enforce_disk_budget(budget, db, user_id)
 
             except Exception as e:
-                msg = f"Extraction failed: {str(e)}"
-                logger.error(msg)
-                extraction.status = "failed"
-                db.commit()
-                self.update_progress(extraction_id, "failed", 0, error=msg)
+                fail_extractions(self, db, extractions, user_id, f"Extraction failed: {str(e)}")
                 raise
+    finally:
+        # Partial windows belong to this job alone, success or not
+        if fetch_mode == "partial" and os.path.exists(source_path):
+            os.remove(source_path)
+        get_scheduler().release(user_id, slots)
 
+def enforce_disk_budget(budget, db, user_id: int):
+    # The clips are done either way; eviction trouble is only worth a log line
+    try:
+        budget.enforce(db, user_id)
     except Exception as e:
-        logger.error(f"Task error: {str(e)}")
-        self.update_progress(extraction_id, "failed", 0, error=str(e))
-        raise
+        db.rollback()
+        logger.error(f"Disk budget enforcement failed after extractions for user {user_id}: {e}")
 
-def process_video(video_path, start_seconds, duration, extraction_id):
-    """Process video using ffmpeg"""
+def clip_output_path(output_dir: Path, extraction_id: int) -> Path:
+    dt_tag = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return Path(output_dir) / f"clip_{extraction_id}_{dt_tag}.mp4"
+
+def process_video(video_path, start_seconds, duration, extraction_id, output_dir=None, on_progress=None, metadata=None, scratch_dir=None):
+    """Cut a clip with ffmpeg and hand it to storage, returning its storage key"""
     try:
-        dt_tag = datetime.now().strftime("%Y%m%d-%H%M%S")
-        output_file = Path(video_path).parent / f"clip_{extraction_id}_{dt_tag}.mp4"
-
-        stream = ffmpeg.input(str(video_path))
-        stream = ffmpeg.output(
-            stream,
-            str(output_file),
-            ss=start_seconds,
-            t=duration,
-            acodec='copy',
-            vcodec='copy'
-        )
-        ffmpeg.run(stream, overwrite_output=True, capture_stderr=True)
+        output_file = clip_output_path(output_dir or Path(video_path).parent, extraction_id)
 
-        return output_file
+        output_file = cut_clip(
+            Path(video_path),
+            output_file,
+            start_seconds,
+            duration,
+            on_progress=on_progress,
+            metadata=metadata,
+            scratch_dir=scratch_dir
+        )
     except Exception as e:
         raise Exception(f"Video processing failed: {str(e)}")
+    return store_clip(output_file)
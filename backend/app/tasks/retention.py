@@ -0,0 +1,160 @@
+# backend/app/tasks/retention.py
+# Periodic removal of clips older than CLEANUP_DAYS, and disk budget enforcement
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.celery import celery_app
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from app.core.redis import get_redis_pool
+from app.db.base import get_db_context
+from app.db.models import Extraction, ExtractionStatus, utcnow
+from app.video.budget import get_disk_budget
+from app.video.storage import storage_for
+
+settings = get_settings()
+logger = get_videos_logger()
+
+METRICS_NAMESPACE = "retention"
+LOCK_KEY = "retention:sweep_lock"
+BUDGET_LOCK_KEY = "retention:budget_lock"
+
+def delete_clip(key: str) -> Tuple[str, int, bool]:
+    """Remove one stored clip, returning (key, bytes freed, success)"""
+    try:
+        return key, storage_for(key).delete(key), True
+    except Exception as e:
+        logger.error(f"Retention: failed to delete {key}: {str(e)}")
+        return key, 0, False
+
+def expired_batch(db: Session, cutoff: datetime, after: Tuple[datetime, int], size: int) -> List[Extraction]:
+    """The next page of expired clips, in (extraction_datetime, id) order"""
+    query = db.query(Extraction).filter(
+        Extraction.status == ExtractionStatus.COMPLETED,
+        Extraction.file_path.isnot(None),
+        Extraction.extraction_datetime < cutoff
+    )
+    if after:
+        after_datetime, after_id = after
+        query = query.filter(or_(
+            Extraction.extraction_datetime > after_datetime,
+            and_(Extraction.extraction_datetime == after_datetime, Extraction.id > after_id)
+        ))
+    return query.order_by(Extraction.extraction_datetime, Extraction.id).limit(size).all()
+
+def sweep_expired(days: int = None, batch_size: int = None, workers: int = None) -> Dict[str, float]:
+    """
+    Expire completed extractions older than `days` and delete their clips.
+
+    Rows are walked in keyset-paged batches so memory stays flat whatever the
+    backlog. Each batch's files are deleted concurrently, then the batch is
+    committed on its own, so a crash loses at most one batch of bookkeeping:
+    the next run picks up the remaining rows, and a clip that is already gone
+    counts as deleted. Rows whose file could not be deleted stay completed
+    and are retried on the next run.
+    """
+    days = settings.CLEANUP_DAYS if days is None else days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    workers = workers or settings.RETENTION_DELETE_WORKERS
+    cutoff = utcnow() - timedelta(days=days)
+
+    started = time.monotonic()
+    report = {"batches": 0, "expired": 0, "failed": 0, "bytes_reclaimed": 0}
+    after = None
+
+    with get_db_context() as db, ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = expired_batch(db, cutoff, after, batch_size)
+            if not batch:
+                break
+            after = (batch[-1].extraction_datetime, batch[-1].id)
+
+            results = {key: (freed, ok) for key, freed, ok in pool.map(delete_clip, [e.file_path for e in batch])}
+            for extraction in batch:
+                freed, ok = results[extraction.file_path]
+                if not ok:
+                    report["failed"] += 1
+                    continue
+                # Through the ORM so the status counts follow
+                extraction.update_status(ExtractionStatus.EXPIRED)
+                extraction.file_path = None
+                report["expired"] += 1
+                report["bytes_reclaimed"] += freed
+            db.commit()
+            # Nothing in the batch needs to stay in the identity map
+            db.expunge_all()
+
+            report["batches"] += 1
+            metrics.incr(METRICS_NAMESPACE, "batches")
+
+    report["runtime_seconds"] = round(time.monotonic() - started, 3)
+    metrics.incr(METRICS_NAMESPACE, "expired", report["expired"])
+    metrics.incr(METRICS_NAMESPACE, "delete_failures", report["failed"])
+    metrics.incr(METRICS_NAMESPACE, "bytes_reclaimed", report["bytes_reclaimed"])
+    metrics.observe(METRICS_NAMESPACE, "runtime_seconds", report["runtime_seconds"])
+    logger.info(
+        f"Retention sweep: expired {report['expired']} extractions older than {days} days "
+        f"in {report['batches']} batches, reclaimed {report['bytes_reclaimed']} bytes "
+        f"in {report['runtime_seconds']:.2f}s ({report['failed']} failed)"
+    )
+    return report
+
+@celery_app.task
+def sweep_expired_extractions() -> Dict[str, float]:
+    """Beat entry point; a run still in progress makes the next one a no-op"""
+    lock = get_redis_pool().lock(LOCK_KEY, timeout=settings.RETENTION_LOCK_TIMEOUT_SECONDS)
+    if not lock.acquire(blocking=False):
+        logger.info("Retention sweep already running, skipping")
+        return {}
+    try:
+        return sweep_expired()
+    finally:
+        lock.release()
+
+@celery_app.task
+def enforce_disk_budget() -> int:
+    """
+    Size clips that predate size tracking, then apply every user's quota and
+    the global high-water mark. Clip completion enforces the budget too; this
+    catches up after restarts and configuration changes.
+    """
+    lock = get_redis_pool().lock(BUDGET_LOCK_KEY, timeout=settings.RETENTION_LOCK_TIMEOUT_SECONDS)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        budget = get_disk_budget()
+        with get_db_context() as db:
+            budget.backfill_sizes(db)
+            return budget.enforce_all_users(db) + budget.enforce(db)
+    finally:
+        lock.release()
+
+@celery_app.on_after_finalize.connect
+def schedule_retention_sweep(sender, **kwargs):
+    sender.add_periodic_task(
+        settings.RETENTION_SWEEP_INTERVAL_SECONDS,
+        sweep_expired_extractions.s(),
+        name="retention sweep"
+    )
+    sender.add_periodic_task(
+        settings.DISK_BUDGET_SWEEP_INTERVAL_SECONDS,
+        enforce_disk_budget.s(),
+        name="disk budget"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the retention sweep once, outside Celery")
+    parser.add_argument("--days", type=int, default=None, help="defaults to CLEANUP_DAYS")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(sweep_expired(args.days, args.batch_size, args.workers))
@@ -0,0 +1,276 @@
+# backend/app/tasks/scheduler.py
+# Fair admission of extraction jobs onto the Celery queues
+
+import json
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Dict, List
+
+from redis.exceptions import LockError
+from sqlalchemy import case, func, update
+
+from app.core import metrics
+from app.core.celery import celery_app
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from app.core.redis import get_redis_pool
+from app.db.base import get_db_context
+from app.db.models import Extraction, TERMINAL_STATUSES, User, utcnow
+
+settings = get_settings()
+logger = get_videos_logger()
+
+# Network-bound fetches and CPU-bound ffmpeg work scale independently
+DOWNLOAD_QUEUE = "downloads"
+FFMPEG_QUEUE = "ffmpeg"
+
+METRICS_NAMESPACE = "scheduler"
+
+def queue_metrics_namespace(queue: str) -> str:
+    return f"queue_{queue}"
+
+def record_enqueued(queue: str):
+    metrics.incr(queue_metrics_namespace(queue), "depth")
+    metrics.incr(queue_metrics_namespace(queue), "enqueued")
+
+def record_started(queue: str, enqueued_at: float = None):
+    """Called when a worker picks a job up, to track depth and wait time"""
+    metrics.incr(queue_metrics_namespace(queue), "depth", -1)
+    if enqueued_at:
+        metrics.observe(queue_metrics_namespace(queue), "wait_seconds", time.time() - enqueued_at)
+
+class FairScheduler:
+    """
+    Holds submitted jobs in per-user Redis lists and admits them to the
+    download queue in weighted fair order. Each backlogged user has a virtual
+    time that advances by cost / weight whenever one of their jobs is admitted,
+    and the user with the lowest virtual time goes next, so a user submitting
+    hundreds of clips cannot starve everyone else. Users at their concurrency
+    cap (User.active_extractions) are skipped until one of their jobs ends.
+    Slots are returned when a job ends; reconcile() repairs the counts of
+    jobs whose worker died without getting that far.
+    """
+
+    def __init__(self, redis, max_active: int, weights: Dict[int, float], namespace: str = "scheduler"):
+        self.redis = redis
+        self.max_active = max_active
+        self.weights = weights
+        self.namespace = namespace
+
+    def _key(self, *parts) -> str:
+        return ":".join((self.namespace,) + tuple(str(p) for p in parts))
+
+    def weight(self, user_id: int) -> float:
+        return self.weights.get(user_id, 1.0)
+
+    def _lock(self):
+        return self.redis.lock(self._key("dispatch_lock"), timeout=30, blocking_timeout=10)
+
+    def submit(self, user_id: int, extraction_ids: List[int]):
+        """
+        Queue a job (one or more extractions of one source) and try to admit
+        it. Raises only if the job could not be queued; callers must then
+        fail its rows, nothing else will ever pick them up.
+        """
+        job = {
+            "user_id": user_id,
+            "extraction_ids": extraction_ids,
+            "submitted_at": time.time()
+        }
+        # Under the dispatch lock so a concurrent dispatch cannot drop the user
+        # from the ranking between our push and our registration
+        try:
+            with self._lock():
+                self._push(user_id, job)
+        except LockError:
+            # The row is already committed, so queue it regardless; should a
+            # concurrent dispatch drop the user, reconcile() registers them again
+            logger.warning(f"Dispatch lock busy, queueing extractions {extraction_ids} without it")
+            metrics.incr(METRICS_NAMESPACE, "unlocked_submits")
+            self._push(user_id, job)
+
+        metrics.incr(METRICS_NAMESPACE, "submitted")
+        try:
+            self._try_dispatch()
+        except Exception as e:
+            # Queued all the same; the next submit, release or reconcile admits it
+            logger.error(f"Admission failed after queueing extractions {extraction_ids}: {e}")
+            metrics.incr(METRICS_NAMESPACE, "dispatch_failures")
+
+    def _push(self, user_id: int, job: dict):
+        self.redis.rpush(self._key("pending", user_id), json.dumps(job))
+        self._register(user_id)
+
+    def _register(self, user_id: int):
+        # Returning users resume at the current floor so idle time is not banked
+        if self.redis.zscore(self._key("vtime"), user_id) is None:
+            lowest = self.redis.zrange(self._key("vtime"), 0, 0, withscores=True)
+            floor = lowest[0][1] if lowest else 0.0
+            last = float(self.redis.hget(self._key("last_vtime"), user_id) or 0)
+            self.redis.zadd(self._key("vtime"), {user_id: max(floor, last)})
+
+    def _try_dispatch(self):
+        # Whoever holds the lock is dispatching already; the next release,
+        # submit or reconcile admits anything that run missed
+        try:
+            self.dispatch()
+        except LockError:
+            logger.info("Dispatch lock busy, leaving admission to the current holder")
+
+    def release(self, user_id: int, count: int):
+        """Free the slots a finished or failed job held, then admit more work"""
+        with get_db_context() as db:
+            self._release_slots(db, user_id, count)
+        self._try_dispatch()
+
+    def reconcile(self, stale_seconds: int) -> int:
+        """
+        Recompute every user's active_extractions from their unfinished rows,
+        leaving out rows still waiting for admission and rows with no progress
+        for stale_seconds (their worker was killed or lost). Also re-registers
+        users whose queued jobs fell out of the ranking. Returns the number of
+        users whose count was corrected.
+        """
+        corrected = 0
+        with self._lock(), get_db_context() as db:
+            waiting = set()
+            for key in self.redis.scan_iter(match=self._key("pending", "*")):
+                key = key.decode() if isinstance(key, bytes) else key
+                jobs = [json.loads(raw) for raw in self.redis.lrange(key, 0, -1)]
+                if jobs:
+                    self._register(int(key.rsplit(":", 1)[1]))
+                for job in jobs:
+                    waiting.update(job["extraction_ids"])
+
+            cutoff = utcnow() - timedelta(seconds=stale_seconds)
+            query = db.query(Extraction.creator_id, func.count(Extraction.id)).filter(
+                Extraction.status.notin_(TERMINAL_STATUSES),
+                Extraction.last_updated >= cutoff
+            )
+            if waiting:
+                query = query.filter(Extraction.id.notin_(waiting))
+            held = dict(query.group_by(Extraction.creator_id).all())
+
+            users = db.query(User).filter(
+                (func.coalesce(User.active_extractions, 0) > 0) | User.id.in_(list(held))
+            ).all()
+            for user in users:
+                actual = held.get(user.id, 0)
+                if (user.active_extractions or 0) != actual:
+                    logger.warning(
+                        f"Reconciled active extractions for user {user.id}: "
+                        f"{user.active_extractions} -> {actual}"
+                    )
+                    user.active_extractions = actual
+                    corrected += 1
+            db.commit()
+
+        metrics.incr(METRICS_NAMESPACE, "reconciled_users", corrected)
+        self._try_dispatch()
+        return corrected
+
+    def _release_slots(self, db, user_id: int, count: int):
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(active_extractions=case(
+                (func.coalesce(User.active_extractions, 0) > count, User.active_extractions - count),
+                else_=0
+            ))
+        )
+        db.commit()
+
+    def _acquire_slots(self, db, user_id: int, count: int) -> bool:
+        # A job larger than the cap still runs once the user has nothing else in flight
+        active = func.coalesce(User.active_extractions, 0)
+        result = db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .where((active + count <= self.max_active) | (active == 0))
+            .values(active_extractions=active + count)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def dispatch(self) -> int:
+        """Admit queued jobs until every backlogged user is empty or at their cap"""
+        admitted = 0
+        with self._lock(), get_db_context() as db:
+            while True:
+                progressed = False
+                for member, vtime in self.redis.zrange(self._key("vtime"), 0, -1, withscores=True):
+                    user_id = int(member)
+                    raw = self.redis.lindex(self._key("pending", user_id), 0)
+                    if raw is None:
+                        self.redis.zrem(self._key("vtime"), member)
+                        self.redis.hset(self._key("last_vtime"), user_id, vtime)
+                        continue
+
+                    job = json.loads(raw)
+                    cost = len(job["extraction_ids"])
+                    if not self._acquire_slots(db, user_id, cost):
+                        continue
+
+                    try:
+                        self._enqueue(job)
+                    except Exception:
+                        # Leave the job queued and give the slots back
+                        self._release_slots(db, user_id, cost)
+                        raise
+
+                    self.redis.lpop(self._key("pending", user_id))
+                    self.redis.zadd(self._key("vtime"), {member: vtime + cost / self.weight(user_id)})
+                    admitted += 1
+                    progressed = True
+                    # Re-rank after every admission
+                    break
+
+                if not progressed:
+                    break
+
+            pending = sum(
+                self.redis.llen(self._key("pending", int(member)))
+                for member in self.redis.zrange(self._key("vtime"), 0, -1)
+            )
+        metrics.set_gauge(METRICS_NAMESPACE, "pending_jobs", pending)
+        return admitted
+
+    def _enqueue(self, job: dict):
+        metrics.observe(METRICS_NAMESPACE, "admission_wait_seconds", time.time() - job["submitted_at"])
+        celery_app.send_task(
+            "app.tasks.extraction.download_extractions",
+            kwargs={
+                "user_id": job["user_id"],
+                "extraction_ids": job["extraction_ids"],
+                "enqueued_at": time.time()
+            },
+            queue=DOWNLOAD_QUEUE
+        )
+        record_enqueued(DOWNLOAD_QUEUE)
+        logger.info(f"Admitted extractions {job['extraction_ids']} for user {job['user_id']}")
+
+@celery_app.task
+def reconcile_scheduler() -> int:
+    """Beat entry point for FairScheduler.reconcile"""
+    try:
+        return get_scheduler().reconcile(settings.SCHEDULER_SLOT_STALE_SECONDS)
+    except LockError:
+        return 0
+
+@celery_app.on_after_finalize.connect
+def schedule_reconcile(sender, **kwargs):
+    sender.add_periodic_task(
+        settings.SCHEDULER_RECONCILE_INTERVAL_SECONDS,
+        reconcile_scheduler.s(),
+        name="scheduler reconcile"
+    )
+
+@lru_cache()
+def get_scheduler() -> FairScheduler:
+    """Get the process-wide scheduler"""
+    return FairScheduler(
+        get_redis_pool(),
+        max_active=settings.MAX_ACTIVE_EXTRACTIONS_PER_USER,
+        weights=settings.SCHEDULER_USER_WEIGHTS
+    )
@@ -5,17 +5,19 @@ import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
 
-from app.db.models import Extraction, ExtractionStatus
+from app.db.models import Extraction, ExtractionStatus, utcnow
 from app.core.websocket_manager import get_websocket_manager
 
+# Shared by every worker host: the ffmpeg stage reads the sources the download stage leaves here
+DEFAULT_DEST_DIR = Path(__file__).parent.parent.parent / "extractions"
+
 class BaseWorker(ABC):
     """Base class for content download and extraction"""
 
     def __init__(self, dest_dir: Optional[Path] = None):
         if not dest_dir:
-            dest_dir = Path(__file__).parent.parent.parent / "extractions"
+            dest_dir = DEFAULT_DEST_DIR
         self.dest_dir = dest_dir
         self.temp_dir = dest_dir / "temp"
         self.temp_files = []
@@ -70,7 +72,7 @@ class ProgressTracker:
             self.extraction.progress = progress
         if error:
             self.extraction.error_message = error
-        self.extraction.last_updated = datetime.now()
+        self.extraction.last_updated = utcnow()
 
         # Send WebSocket update
         await self.ws_manager.send_extraction_update(
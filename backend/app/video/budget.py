@@ -0,0 +1,226 @@
+# backend/app/video/budget.py
+# Disk budget for finished clips: global and per-user quotas with LRU eviction
+
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from app.db.models import Extraction, ExtractionStatus, utcnow
+from .base import DEFAULT_DEST_DIR
+from .cache import SourceCache
+from .storage import LocalStorage, get_storage, storage_for
+from .workspace import sweep_orphans
+
+settings = get_settings()
+logger = get_videos_logger()
+
+class DiskBudget:
+    """
+    Keeps the workers' disk from filling up between retention sweeps. With
+    `max_bytes` set, the completed clips recorded in Extraction.size_bytes
+    are capped at that many bytes wherever they are stored. With
+    `measure_disk` instead, the real usage of the filesystem holding `root`
+    is watched; regenerable data (cached sources, orphaned scratch) goes
+    first and clips only after, never more than the clips themselves hold.
+    With neither, only per-user quotas apply. Once usage crosses
+    `high_water`, clips are evicted least recently accessed first until it
+    is back under `low_water`. A user over `user_max_bytes` loses their own
+    oldest clips the same way. Evicted rows are marked expired, exactly like
+    age-based retention.
+    """
+
+    METRICS_NAMESPACE = "disk_budget"
+    PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: Optional[int] = None,
+        measure_disk: bool = False,
+        user_max_bytes: Optional[int] = None,
+        high_water: float = 0.9,
+        low_water: float = 0.8
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.measure_disk = measure_disk
+        self.user_max_bytes = user_max_bytes
+        self.high_water = high_water
+        self.low_water = low_water
+
+    def _stored(self, db: Session):
+        return db.query(func.coalesce(func.sum(Extraction.size_bytes), 0)).filter(
+            Extraction.status == ExtractionStatus.COMPLETED
+        )
+
+    def total_bytes(self, db: Session) -> int:
+        return self._stored(db).scalar()
+
+    def user_bytes(self, db: Session, user_id: int) -> int:
+        return self._stored(db).filter(Extraction.creator_id == user_id).scalar()
+
+    def clips_share_disk(self) -> bool:
+        """Whether evicting clips frees space on root's filesystem"""
+        storage = get_storage()
+        if not isinstance(storage, LocalStorage):
+            return False
+        storage.root.mkdir(parents=True, exist_ok=True)
+        return os.stat(storage.root).st_dev == os.stat(self.root).st_dev
+
+    def usage(self, db: Session) -> Optional[Tuple[int, int]]:
+        """(bytes used, capacity) that the water marks apply to, None without a global budget"""
+        if self.max_bytes:
+            return self.total_bytes(db), self.max_bytes
+        if not self.measure_disk:
+            return None
+        self.root.mkdir(parents=True, exist_ok=True)
+        disk = shutil.disk_usage(self.root)
+        return disk.used, disk.total
+
+    def _free_regenerable(self, db: Session, excess: int):
+        """Drop data that can be fetched or rebuilt again before touching anyone's clips"""
+        sweep_orphans()
+        cache = SourceCache(self.root, settings.SOURCE_CACHE_MAX_BYTES)
+        evicted = cache.evict(db, max_bytes=max(0, cache.total_bytes(db) - excess))
+        if evicted:
+            logger.info(f"Disk budget: evicted {evicted} cached sources")
+
+    def touch(self, extraction: Extraction):
+        extraction.last_accessed = utcnow()
+
+    def record_size(self, extraction: Extraction):
+        """Size a freshly stored clip and start its access clock"""
+        self.touch(extraction)
+        try:
+            extraction.size_bytes = storage_for(extraction.file_path).size(extraction.file_path)
+        except Exception as e:
+            # backfill_sizes picks it up on the next sweep
+            logger.warning(f"Failed to size {extraction.file_path}: {e}")
+
+    def backfill_sizes(self, db: Session, limit: int = 500) -> int:
+        """Size completed clips stored before sizes were tracked"""
+        extractions = db.query(Extraction).filter(
+            Extraction.status == ExtractionStatus.COMPLETED,
+            Extraction.file_path.isnot(None),
+            Extraction.size_bytes.is_(None)
+        ).limit(limit).all()
+        for extraction in extractions:
+            try:
+                extraction.size_bytes = storage_for(extraction.file_path).size(extraction.file_path) or 0
+            except Exception as e:
+                logger.warning(f"Failed to size {extraction.file_path}: {e}")
+        db.commit()
+        return len(extractions)
+
+    def _evict(self, db: Session, excess: int, user_id: int = None) -> int:
+        """Expire least recently accessed clips until `excess` bytes are freed"""
+        freed = 0
+        skipped = set()
+        while freed < excess:
+            # Only sized clips count towards usage, so only they can bring it down
+            query = db.query(Extraction).filter(
+                Extraction.status == ExtractionStatus.COMPLETED,
+                Extraction.file_path.isnot(None),
+                Extraction.size_bytes.isnot(None)
+            )
+            if user_id is not None:
+                query = query.filter(Extraction.creator_id == user_id)
+            if skipped:
+                query = query.filter(Extraction.id.notin_(skipped))
+            page = query.order_by(Extraction.last_accessed.asc(), Extraction.id.asc()).limit(self.PAGE_SIZE).all()
+            if not page:
+                break
+
+            for extraction in page:
+                if freed >= excess:
+                    break
+                try:
+                    storage_for(extraction.file_path).delete(extraction.file_path)
+                except Exception as e:
+                    logger.error(f"Failed to evict {extraction.file_path}: {e}")
+                    skipped.add(extraction.id)
+                    continue
+
+                size = extraction.size_bytes or 0
+                freed += size
+                extraction.update_status(ExtractionStatus.EXPIRED)
+                extraction.file_path = None
+                metrics.incr(self.METRICS_NAMESPACE, "evictions")
+                metrics.incr(self.METRICS_NAMESPACE, "evicted_bytes", size)
+                if user_id is not None:
+                    metrics.incr(self.METRICS_NAMESPACE, "user_quota_evictions")
+            # Commit per page so a crash never leaves deleted files on completed rows
+            db.commit()
+        return freed
+
+    def enforce(self, db: Session, user_id: int = None) -> int:
+        """
+        Apply the per-user quota (to `user_id`, when given) and the global
+        high-water mark. Returns the bytes freed.
+        """
+        freed = 0
+        if user_id is not None and self.user_max_bytes:
+            used = self.user_bytes(db, user_id)
+            if used > self.user_max_bytes:
+                freed += self._evict(db, used - self.user_max_bytes, user_id=user_id)
+
+        usage = self.usage(db)
+        if usage is None:
+            return freed
+
+        used, capacity = usage
+        if used > capacity * self.high_water and not self.max_bytes:
+            self._free_regenerable(db, used - int(capacity * self.low_water))
+            used, capacity = self.usage(db)
+
+        if used > capacity * self.high_water:
+            target = int(capacity * self.low_water)
+            if self.max_bytes or self.clips_share_disk():
+                # On a measured disk the rest may not be clips at all
+                excess = min(used - target, self.total_bytes(db))
+                logger.info(f"Disk budget: {used} of {capacity} bytes used, evicting {excess} bytes of clips")
+                freed += self._evict(db, excess)
+                used, capacity = self.usage(db)
+            else:
+                # Clips live elsewhere (object storage, another mount): evicting them frees nothing here
+                logger.warning(f"Disk budget: {used} of {capacity} bytes used under {self.root}, not by clips")
+
+        metrics.set_gauge(self.METRICS_NAMESPACE, "used_bytes", used)
+        metrics.set_gauge(self.METRICS_NAMESPACE, "budget_bytes", capacity)
+        metrics.set_gauge(self.METRICS_NAMESPACE, "headroom_bytes", capacity * self.high_water - used)
+        metrics.set_gauge(self.METRICS_NAMESPACE, "clip_bytes", self.total_bytes(db))
+        return freed
+
+    def enforce_all_users(self, db: Session) -> int:
+        """Apply the per-user quota to every user currently over it"""
+        if not self.user_max_bytes:
+            return 0
+        over = db.query(Extraction.creator_id).filter(
+            Extraction.status == ExtractionStatus.COMPLETED
+        ).group_by(Extraction.creator_id).having(
+            func.sum(Extraction.size_bytes) > self.user_max_bytes
+        ).all()
+        return sum(
+            self._evict(db, self.user_bytes(db, user_id) - self.user_max_bytes, user_id=user_id)
+            for (user_id,) in over
+        )
+
+@lru_cache()
+def get_disk_budget() -> DiskBudget:
+    """Budget over the workers' dest_dir, as configured by the DISK_BUDGET_* settings"""
+    return DiskBudget(
+        DEFAULT_DEST_DIR,
+        max_bytes=settings.DISK_BUDGET_BYTES,
+        measure_disk=settings.DISK_BUDGET_MEASURE_DISK,
+        user_max_bytes=settings.DISK_BUDGET_USER_BYTES,
+        high_water=settings.DISK_BUDGET_HIGH_WATER,
+        low_water=settings.DISK_BUDGET_LOW_WATER
+    )
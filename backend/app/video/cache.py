@@ -0,0 +1,118 @@
+# backend/app/video/cache.py
+# Content-addressed cache of downloaded source media
+
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.logger import get_videos_logger
+from app.db.models import Extraction, SourceMedia, utcnow
+from .probe import get_media_metadata, sidecar_path
+
+logger = get_videos_logger()
+
+class SourceCache:
+    """
+    Stores each downloaded episode once under `<dest_dir>/sources`, keyed by
+    its Spotify episode id. Entries are pinned while an Extraction row points
+    at them through `file_path`; unpinned entries are evicted least recently
+    used first once the cache grows past `max_bytes`. Sources never go
+    through STORAGE_BACKEND, ffmpeg reads them as plain files, so dest_dir
+    must be one volume mounted at the same path on every worker: the ffmpeg
+    stage that cuts a source may run on another host than the download.
+    """
+
+    METRICS_NAMESPACE = "source_cache"
+
+    def __init__(self, dest_dir: Path, max_bytes: int):
+        self.cache_dir = dest_dir / "sources"
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def lookup(self, db: Session, episode_id: str) -> Optional[Path]:
+        """Return the cached media for an episode, or None on a miss"""
+        entry = db.query(SourceMedia).get(episode_id)
+        if entry and os.path.exists(entry.file_path):
+            entry.last_accessed = utcnow()
+            entry.hits = (entry.hits or 0) + 1
+            db.commit()
+            metrics.incr(self.METRICS_NAMESPACE, "hits")
+            return Path(entry.file_path)
+
+        if entry:
+            # The file was removed behind our back, forget about it
+            db.delete(entry)
+            db.commit()
+
+        metrics.incr(self.METRICS_NAMESPACE, "misses")
+        return None
+
+    def store(self, db: Session, episode_id: str, path: Path) -> Path:
+        """Move a freshly downloaded file into the cache and index it"""
+        cached_path = self.cache_dir / f"{episode_id}{Path(path).suffix}"
+        shutil.move(str(path), cached_path)
+        size = cached_path.stat().st_size
+
+        db.merge(SourceMedia(
+            episode_id=episode_id,
+            file_path=str(cached_path),
+            size_bytes=size,
+            last_accessed=utcnow(),
+            hits=0
+        ))
+        db.commit()
+
+        metrics.incr(self.METRICS_NAMESPACE, "stored_bytes", size)
+
+        # Probe once now so every later clip of this episode reads the sidecar
+        try:
+            get_media_metadata(cached_path)
+        except Exception as e:
+            logger.warning(f"Failed to probe cached source {cached_path}: {e}")
+
+        return cached_path
+
+    def ref_count(self, db: Session, entry: SourceMedia) -> int:
+        """Number of extractions currently reading from this entry"""
+        return db.query(Extraction).filter(Extraction.file_path == entry.file_path).count()
+
+    def total_bytes(self, db: Session) -> int:
+        return db.query(func.coalesce(func.sum(SourceMedia.size_bytes), 0)).scalar()
+
+    def evict(self, db: Session, max_bytes: int = None) -> int:
+        """Evict unreferenced entries, oldest access first, until under max_bytes (default: the budget)"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_bytes(db)
+        evicted = 0
+
+        if total > max_bytes:
+            entries = db.query(SourceMedia).order_by(SourceMedia.last_accessed.asc()).all()
+            for entry in entries:
+                if total <= max_bytes:
+                    break
+                if self.ref_count(db, entry):
+                    continue
+
+                try:
+                    for path in (entry.file_path, sidecar_path(entry.file_path)):
+                        if os.path.exists(path):
+                            os.remove(path)
+                except OSError as e:
+                    logger.error(f"Failed to evict cached source {entry.file_path}: {e}")
+                    continue
+
+                total -= entry.size_bytes or 0
+                evicted += 1
+                db.delete(entry)
+                metrics.incr(self.METRICS_NAMESPACE, "evictions")
+                metrics.incr(self.METRICS_NAMESPACE, "evicted_bytes", entry.size_bytes or 0)
+
+            db.commit()
+
+        metrics.set_gauge(self.METRICS_NAMESPACE, "size_bytes", total)
+        return evicted
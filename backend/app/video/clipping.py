@@ -0,0 +1,277 @@
+# backend/app/video/clipping.py
+# Cut clips out of source media: stream copy, full re-encode or smart cut
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import ffmpeg
+
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from .ffmpeg_progress import ProgressCallback, run_with_progress
+from .probe import keyframe_times, probe_media, video_stream
+
+settings = get_settings()
+logger = get_videos_logger()
+
+CLIP_MODES = ("copy", "smart", "reencode")
+
+# Encoders able to produce segments that concatenate with a copied middle
+ENCODERS = {
+    "h264": "libx264",
+    "hevc": "libx265",
+    "mpeg4": "mpeg4"
+}
+
+# Edges shorter than this are left out instead of being re-encoded
+MIN_EDGE_SECONDS = 0.001
+
+def container_args(dst: Path) -> dict:
+    """Move the moov atom to the front of mp4 outputs so playback starts before the download ends"""
+    return {"movflags": "+faststart"} if Path(dst).suffix == ".mp4" else {}
+
+def probe_video(path: Path, start: float, end: float) -> Optional[dict]:
+    """
+    Video stream info plus keyframe times within start..end, read from packet
+    flags so nothing is decoded. Returns None for audio-only media.
+    """
+    info = ffmpeg.probe(
+        str(path),
+        select_streams="v:0",
+        show_entries="packet=pts_time,flags",
+        read_intervals=f"{start}%{end}"
+    )
+    if not info.get("streams"):
+        return None
+
+    return {"stream": info["streams"][0], "keyframes": keyframe_times(info.get("packets", []))}
+
+def _scaled(on_progress: Optional[ProgressCallback], offset: float, weight: float) -> Optional[ProgressCallback]:
+    """Report one step of a multi-step cut as a slice of the overall progress"""
+    if on_progress is None:
+        return None
+
+    def report(fraction, speed, eta):
+        on_progress(offset + weight * fraction, speed, eta)
+    return report
+
+def copy_cut(src: Path, dst: Path, start: float, duration: float, on_progress: Optional[ProgressCallback] = None) -> Path:
+    """Stream copy; fast, but the start snaps to the previous keyframe"""
+    if settings.CLIP_INPUT_SEEK:
+        # Seek in the demuxer instead of reading everything before the clip
+        stream = ffmpeg.input(str(src), ss=start, t=duration)
+        stream = ffmpeg.output(stream, str(dst), acodec="copy", vcodec="copy", **container_args(dst))
+    else:
+        stream = ffmpeg.input(str(src))
+        stream = ffmpeg.output(stream, str(dst), ss=start, t=duration, acodec="copy", vcodec="copy", **container_args(dst))
+    run_with_progress(stream, duration, on_progress)
+    return dst
+
+def reencode_cut(
+    src: Path,
+    dst: Path,
+    start: float,
+    duration: float,
+    on_progress: Optional[ProgressCallback] = None,
+    video: Optional[dict] = None,
+    acodec: str = "aac"
+) -> Path:
+    """Frame-accurate cut by decoding and re-encoding the whole range"""
+    output_args = {"acodec": acodec}
+    if video:
+        # Match the source so the segment can be concatenated with copied video
+        output_args.update(
+            vcodec=ENCODERS[video["codec_name"]],
+            pix_fmt=video.get("pix_fmt", "yuv420p"),
+            s=f"{video['width']}x{video['height']}"
+        )
+    else:
+        output_args["vcodec"] = "libx264"
+
+    stream = ffmpeg.input(str(src), ss=start, t=duration)
+    stream = ffmpeg.output(stream, str(dst), **output_args, **container_args(dst))
+    run_with_progress(stream, duration, on_progress)
+    return dst
+
+def smart_cut(
+    src: Path,
+    dst: Path,
+    start: float,
+    duration: float,
+    on_progress: Optional[ProgressCallback] = None,
+    metadata: Optional[dict] = None,
+    scratch_dir: Optional[Path] = None
+) -> Path:
+    """
+    Frame-accurate cut at near stream-copy speed: the GOP-aligned middle is
+    copied and only the partial GOPs at the head and tail are re-encoded,
+    then the pieces are joined with the concat demuxer. Pass the source's
+    cached metadata to skip probing for keyframes.
+    """
+    end = start + duration
+    if metadata is not None:
+        stream_info = video_stream(metadata)
+        probe = {"stream": stream_info, "keyframes": metadata["keyframes"]} if stream_info else None
+    else:
+        probe = probe_video(src, start, end)
+    if probe is None:
+        # Audio frames are all keyframes, so a copy cut is already accurate
+        return copy_cut(src, dst, start, duration, on_progress)
+
+    video = probe["stream"]
+    if video.get("codec_name") not in ENCODERS:
+        logger.warning(f"Smart cut unsupported for codec {video.get('codec_name')}, using stream copy")
+        return copy_cut(src, dst, start, duration, on_progress)
+
+    keyframes = [k for k in probe["keyframes"] if start <= k <= end]
+    if len(keyframes) < 2:
+        # The clip sits inside one GOP, re-encoding it is as cheap as it gets
+        return reencode_cut(src, dst, start, duration, on_progress, video=video, acodec="copy")
+
+    first_key, last_key = keyframes[0], keyframes[-1]
+    parts_dir = Path(tempfile.mkdtemp(prefix=f"{dst.stem}_", dir=scratch_dir or dst.parent))
+    try:
+        # MPEG-TS parts carry their parameter sets in-band, so the encoded
+        # edges and the copied middle can be joined without re-muxing issues
+        steps = []
+        if first_key - start > MIN_EDGE_SECONDS:
+            steps.append(("head", start, first_key - start))
+        steps.append(("middle", first_key, last_key - first_key))
+        if end - last_key > MIN_EDGE_SECONDS:
+            steps.append(("tail", last_key, end - last_key))
+
+        parts: List[Path] = []
+        offset = 0.0
+        for name, part_start, part_duration in steps:
+            part = parts_dir / f"{name}.ts"
+            report = _scaled(on_progress, offset, part_duration / duration)
+            if name == "middle":
+                stream = ffmpeg.input(str(src), ss=part_start, t=part_duration)
+                stream = ffmpeg.output(stream, str(part), c="copy")
+                run_with_progress(stream, part_duration, report)
+            else:
+                reencode_cut(src, part, part_start, part_duration, report, video=video, acodec="copy")
+            parts.append(part)
+            offset += part_duration / duration
+
+        concat_list = parts_dir / "parts.txt"
+        concat_list.write_text("".join(f"file '{part}'\n" for part in parts))
+        stream = ffmpeg.input(str(concat_list), f="concat", safe=0)
+        stream = ffmpeg.output(stream, str(dst), c="copy", **container_args(dst))
+        run_with_progress(stream, duration)
+        if on_progress:
+            on_progress(1.0, None, 0)
+
+        return dst
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+def cut_clip(
+    src: Path,
+    dst: Path,
+    start: float,
+    duration: float,
+    mode: str = None,
+    on_progress: Optional[ProgressCallback] = None,
+    metadata: Optional[dict] = None,
+    scratch_dir: Optional[Path] = None
+) -> Path:
+    """Cut start..start+duration of src into dst using the configured CLIP_MODE"""
+    mode = mode or settings.CLIP_MODE
+    if mode == "smart":
+        return smart_cut(src, dst, start, duration, on_progress, metadata=metadata, scratch_dir=scratch_dir)
+    if mode == "reencode":
+        return reencode_cut(src, dst, start, duration, on_progress)
+    return copy_cut(src, dst, start, duration, on_progress)
+
+def cut_clips(
+    src: Path,
+    clips: List[Tuple[Path, float, float]],
+    mode: str = None,
+    on_progress: Optional[ProgressCallback] = None,
+    metadata: Optional[dict] = None,
+    scratch_dir: Optional[Path] = None
+) -> List[Path]:
+    """
+    Cut several (dst, start, duration) clips from one source. Copy and
+    re-encode cuts share a single demux pass with one output per clip;
+    smart cuts of video sources need their own concat per clip.
+    """
+    mode = mode or settings.CLIP_MODE
+    metadata = metadata or probe_media(src)
+    if mode == "smart" and video_stream(metadata) is not None:
+        for i, (dst, start, duration) in enumerate(clips):
+            report = _scaled(on_progress, i / len(clips), 1 / len(clips))
+            smart_cut(src, dst, start, duration, report, metadata=metadata, scratch_dir=scratch_dir)
+        return [dst for dst, _, _ in clips]
+
+    # Seek the shared input to the first clip and read only up to the last one
+    span_start = min(start for _, start, _ in clips)
+    span_end = max(start + duration for _, start, duration in clips)
+    codecs = {"acodec": "aac", "vcodec": "libx264"} if mode == "reencode" else {"acodec": "copy", "vcodec": "copy"}
+
+    source = ffmpeg.input(str(src), ss=span_start, t=span_end - span_start)
+    outputs = [
+        ffmpeg.output(source, str(dst), ss=start - span_start, t=duration, **codecs, **container_args(dst))
+        for dst, start, duration in clips
+    ]
+    run_with_progress(ffmpeg.merge_outputs(*outputs), span_end - span_start, on_progress)
+    return [dst for dst, _, _ in clips]
+
+def benchmark(paths: List[Path], clip_seconds: float, modes=CLIP_MODES):
+    """Time each mode on a clip from the middle of every file and report boundary error"""
+    print(f"{'file':<40} {'mode':<9} {'seconds':>8} {'duration':>9} {'error':>7}")
+    for path in paths:
+        total = float(ffmpeg.probe(str(path))["format"]["duration"])
+        start = max((total - clip_seconds) / 2, 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in modes:
+                dst = Path(tmp) / f"{mode}.mp4"
+                started = time.monotonic()
+                cut_clip(path, dst, start, clip_seconds, mode=mode)
+                elapsed = time.monotonic() - started
+
+                actual = float(ffmpeg.probe(str(dst))["format"]["duration"])
+                print(f"{path.name[:40]:<40} {mode:<9} {elapsed:>8.2f} {actual:>9.3f} {actual - clip_seconds:>+7.3f}")
+
+def benchmark_batch(paths: List[Path], clip_seconds: float, clip_count: int, mode: str = None):
+    """Clips per minute for one cut per clip versus a single batched pass"""
+    print(f"{'file':<40} {'path':<9} {'seconds':>8} {'clips/min':>10}")
+    for path in paths:
+        total = float(ffmpeg.probe(str(path))["format"]["duration"])
+        step = max((total - clip_seconds) / clip_count, 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            clips = [(Path(tmp) / f"{i}.mp4", i * step, clip_seconds) for i in range(clip_count)]
+
+            started = time.monotonic()
+            for dst, start, duration in clips:
+                cut_clip(path, dst, start, duration, mode=mode)
+            single = time.monotonic() - started
+
+            started = time.monotonic()
+            cut_clips(path, clips, mode=mode)
+            batched = time.monotonic() - started
+
+        for label, elapsed in (("per-clip", single), ("batch", batched)):
+            print(f"{path.name[:40]:<40} {label:<9} {elapsed:>8.2f} {clip_count * 60 / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark clip modes over a corpus of sample files")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--clip", type=float, default=30.0, help="clip length in seconds")
+    parser.add_argument("--modes", default=",".join(CLIP_MODES))
+    parser.add_argument("--batch", type=int, help="compare per-clip and batched throughput for this many clips")
+    args = parser.parse_args()
+
+    if args.batch:
+        for mode in args.modes.split(","):
+            print(f"mode={mode}")
+            benchmark_batch(args.files, args.clip, args.batch, mode=mode)
+    else:
+        benchmark(args.files, args.clip, modes=args.modes.split(","))
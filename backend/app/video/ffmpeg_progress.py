@@ -0,0 +1,96 @@
+# backend/app/video/ffmpeg_progress.py
+# Run ffmpeg without blocking on its output and report real progress
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import ffmpeg
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# (fraction complete 0..1, speed as a multiple of realtime, seconds remaining)
+ProgressCallback = Callable[[float, Optional[float], Optional[float]], None]
+
+class FFmpegFailed(ffmpeg.Error):
+    """ffmpeg.Error whose message carries the end of stderr, so str(e) says what went wrong"""
+
+    MESSAGE_LINES = 5
+
+    def __init__(self, returncode: int, stderr: bytes):
+        super().__init__("ffmpeg", None, stderr)
+        self.returncode = returncode
+        lines = [line.strip() for line in stderr.decode(errors="replace").splitlines() if line.strip()]
+        self.args = (f"ffmpeg exited with code {returncode}: " + " | ".join(lines[-self.MESSAGE_LINES:]),)
+
+def _parse_speed(value: str) -> Optional[float]:
+    try:
+        return float(value.rstrip("x"))
+    except (AttributeError, ValueError):
+        return None
+
+def _parse_out_seconds(block: dict) -> Optional[float]:
+    # out_time_ms is also reported in microseconds, older builds lack out_time_us
+    value = block.get("out_time_us") or block.get("out_time_ms")
+    try:
+        return int(value) / 1_000_000
+    except (TypeError, ValueError):
+        return None
+
+def run_with_progress(
+    stream,
+    duration: float,
+    on_progress: Optional[ProgressCallback] = None,
+    interval: float = None
+):
+    """
+    Run an ffmpeg-python output stream, parsing `-progress pipe:1` as it is
+    written. on_progress is called at most once per interval seconds, plus
+    once on completion. Raises FFmpegFailed with the stderr tail on failure.
+    """
+    interval = settings.FFMPEG_PROGRESS_INTERVAL_SECONDS if interval is None else interval
+    process = stream.global_args("-progress", "pipe:1", "-nostats").run_async(
+        pipe_stdout=True,
+        pipe_stderr=True,
+        overwrite_output=True
+    )
+
+    # Drain stderr concurrently so a chatty ffmpeg never blocks on a full pipe
+    stderr_tail = deque(maxlen=50)
+    drain = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+    drain.start()
+
+    block = {}
+    last_reported = None
+    for raw in process.stdout:
+        key, _, value = raw.decode(errors="replace").strip().partition("=")
+        block[key] = value
+        if key != "progress":
+            continue
+
+        # A "progress=" line closes each key=value block
+        finished = value == "end"
+        now = time.monotonic()
+        if on_progress and (finished or last_reported is None or now - last_reported >= interval):
+            out_seconds = _parse_out_seconds(block)
+            speed = _parse_speed(block.get("speed"))
+            if finished:
+                fraction = 1.0
+            elif duration and out_seconds is not None:
+                fraction = min(out_seconds / duration, 1.0)
+            else:
+                fraction = 0.0
+            eta = None
+            if speed and out_seconds is not None:
+                eta = max(duration - out_seconds, 0) / speed
+            on_progress(fraction, speed, eta)
+            last_reported = now
+        block = {}
+
+    process.wait()
+    drain.join()
+    if process.returncode:
+        raise FFmpegFailed(process.returncode, b"".join(stderr_tail))
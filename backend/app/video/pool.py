@@ -0,0 +1,142 @@
+# backend/app/video/pool.py
+# Per-process pool of long-lived, authenticated SpotifyWorker instances
+
+import argparse
+import queue
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from .spotify import SpotifyWorker
+
+settings = get_settings()
+logger = get_videos_logger()
+
+class SpotifyWorkerPool:
+    """
+    Keeps SpotifyWorker instances warm for the lifetime of a Celery worker
+    process: the cookies file is parsed once, API sessions stay authenticated
+    and downloader chains are built up front. Tasks check a worker out for the
+    duration of a job, and a background thread refreshes idle workers' tokens.
+    """
+
+    METRICS_NAMESPACE = "worker_pool"
+
+    def __init__(self, cookies_path: Path, size: int = 1, refresh_interval: int = 300):
+        self.cookies_path = cookies_path
+        self.refresh_interval = refresh_interval
+        self._workers: List[SpotifyWorker] = []
+        self._idle = queue.LifoQueue()
+        self._stop = threading.Event()
+
+        for _ in range(size):
+            self._idle.put(self._create_worker())
+
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            name="spotify-auth-refresh",
+            daemon=True
+        )
+        self._refresher.start()
+
+    def _create_worker(self) -> SpotifyWorker:
+        started = time.monotonic()
+        worker = SpotifyWorker(self.cookies_path)
+        worker.warm_up()
+        self._workers.append(worker)
+
+        metrics.observe(self.METRICS_NAMESPACE, "cold_setup_seconds", time.monotonic() - started)
+        return worker
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Borrow a worker for one job"""
+        started = time.monotonic()
+        worker = self._idle.get(timeout=timeout)
+        metrics.observe(self.METRICS_NAMESPACE, "checkout_seconds", time.monotonic() - started)
+
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            # Only touch idle workers so in-flight downloads keep a stable session
+            borrowed = []
+            try:
+                while True:
+                    borrowed.append(self._idle.get_nowait())
+            except queue.Empty:
+                pass
+
+            for worker in borrowed:
+                try:
+                    worker.refresh_auth()
+                except Exception as e:
+                    logger.warning(f"Failed to refresh Spotify session: {e}")
+                    metrics.incr(self.METRICS_NAMESPACE, "refresh_failures")
+                finally:
+                    self._idle.put(worker)
+
+    def close(self):
+        self._stop.set()
+
+_pool: Optional[SpotifyWorkerPool] = None
+
+def init_worker_pool() -> SpotifyWorkerPool:
+    """Create the process-wide pool, called from Celery's worker_process_init"""
+    global _pool
+    if _pool is None:
+        _pool = SpotifyWorkerPool(
+            settings.SPOTIFY_COOKIES_FILE,
+            size=settings.SPOTIFY_WORKER_POOL_SIZE,
+            refresh_interval=settings.SPOTIFY_AUTH_REFRESH_SECONDS
+        )
+    return _pool
+
+def get_worker_pool() -> SpotifyWorkerPool:
+    """Get the process-wide pool, creating it if the init hook did not run"""
+    return _pool or init_worker_pool()
+
+def close_worker_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def benchmark(jobs: int) -> dict:
+    """Per-job setup cost of a fresh SpotifyWorker against a checkout from a warm pool"""
+    cold = []
+    for _ in range(jobs):
+        started = time.monotonic()
+        SpotifyWorker(settings.SPOTIFY_COOKIES_FILE).warm_up()
+        cold.append(time.monotonic() - started)
+
+    pool = SpotifyWorkerPool(settings.SPOTIFY_COOKIES_FILE, size=1, refresh_interval=settings.SPOTIFY_AUTH_REFRESH_SECONDS)
+    pooled = []
+    for _ in range(jobs):
+        started = time.monotonic()
+        with pool.checkout():
+            pass
+        pooled.append(time.monotonic() - started)
+    pool.close()
+
+    return {
+        "jobs": jobs,
+        "cold_setup_ms": round(statistics.median(cold) * 1000, 1),
+        "pooled_checkout_ms": round(statistics.median(pooled) * 1000, 3)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-job SpotifyWorker setup with and without the pool")
+    parser.add_argument("--jobs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(benchmark(args.jobs))
@@ -0,0 +1,96 @@
+# backend/app/video/probe.py
+# ffprobe metadata for source media, cached in a sidecar next to each file
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import ffmpeg
+
+from app.core import metrics
+from app.core.cache import TTLCache
+
+METRICS_NAMESPACE = "probe_cache"
+SIDECAR_SUFFIX = ".probe.json"
+
+STREAM_FIELDS = (
+    "index", "codec_type", "codec_name", "width", "height",
+    "pix_fmt", "sample_rate", "channels", "time_base"
+)
+
+_memory = TTLCache(maxsize=256, ttl=3600)
+
+def sidecar_path(path: Path) -> Path:
+    return Path(path).with_name(Path(path).name + SIDECAR_SUFFIX)
+
+def keyframe_times(packets: List[dict]) -> List[float]:
+    """Keyframe timestamps from ffprobe packet entries (pts_time, flags)"""
+    return sorted(
+        float(packet["pts_time"])
+        for packet in packets
+        if "K" in packet.get("flags", "") and packet.get("pts_time") not in (None, "N/A")
+    )
+
+def probe_media(path: Path) -> dict:
+    """Duration, stream layout and video keyframe index of a media file"""
+    info = ffmpeg.probe(str(path))
+    streams = [
+        {field: stream[field] for field in STREAM_FIELDS if stream.get(field) is not None}
+        for stream in info.get("streams", [])
+    ]
+
+    keyframes = []
+    if any(stream.get("codec_type") == "video" for stream in streams):
+        # Packet flags are enough, nothing has to be decoded
+        packets = ffmpeg.probe(
+            str(path),
+            select_streams="v:0",
+            show_entries="packet=pts_time,flags"
+        ).get("packets", [])
+        keyframes = keyframe_times(packets)
+
+    return {
+        "duration": float(info["format"]["duration"]),
+        "streams": streams,
+        "keyframes": keyframes
+    }
+
+def get_media_metadata(path: Path) -> dict:
+    """
+    Probe metadata for a file, reusing the in-process copy or the sidecar as
+    long as the file's size and mtime still match what was probed
+    """
+    path = Path(path)
+    stat = path.stat()
+    signature = [stat.st_size, stat.st_mtime_ns]
+
+    cached = _memory.get(str(path))
+    if cached and cached["signature"] == signature:
+        return cached
+
+    sidecar = sidecar_path(path)
+    try:
+        cached = json.loads(sidecar.read_text())
+        if cached.get("signature") == signature:
+            _memory.set(str(path), cached)
+            metrics.incr(METRICS_NAMESPACE, "hits")
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    metrics.incr(METRICS_NAMESPACE, "misses")
+    metadata = probe_media(path)
+    metadata["signature"] = signature
+
+    # Write then rename so concurrent readers never see a partial sidecar
+    partial = sidecar.with_name(f"{sidecar.name}.{os.getpid()}")
+    partial.write_text(json.dumps(metadata))
+    os.replace(partial, sidecar)
+
+    _memory.set(str(path), metadata)
+    return metadata
+
+def video_stream(metadata: dict) -> Optional[dict]:
+    """The first video stream of probed media, None for audio-only"""
+    return next((s for s in metadata["streams"] if s.get("codec_type") == "video"), None)
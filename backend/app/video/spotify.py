@@ -1,9 +1,17 @@
 # backend/app/video/spotify.py
 
 from pathlib import Path
-import shutil
+from urllib.parse import urlparse
+import argparse
 import asyncio
-from typing import Optional
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import ffmpeg
 
 from votify.spotify_api import SpotifyApi
 from votify.downloader import Downloader
@@ -14,6 +22,7 @@ from votify.downloader_video import DownloaderVideo
 from votify.enums import AudioQuality, DownloadMode, RemuxModeVideo, VideoFormat
 
 from .base import BaseWorker
+from .ffmpeg_progress import ProgressCallback, run_with_progress
 
 class SpotifyWorker(BaseWorker):
     """Handles Spotify-specific content download and processing"""
@@ -36,25 +45,14 @@ class SpotifyWorker(BaseWorker):
         self._video_downloader = None
         self._episode_video_downloader = None
 
-    def _cleanup_temp_old(self, temp_dir):
-        temp_dir.parent.mkdir(parents=True, exist_ok=True)
-        temp_dir.mkdir(parents=True, exist_ok=True)
-
+    @contextmanager
+    def scratch(self, path: Path):
+        """Point votify's temp files at a job's private workspace for one job"""
+        self.downloader.temp_path = path
         try:
-            shutil.rmtree(temp_dir)
-            temp_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            print(f"Failed to clean temp directory: {e}")
-
-    def __del__(self):
-        """Cleanup temp directory on worker destruction"""
-        try:
-            temp_dir = self.dest_dir / "temp"
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-                temp_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            print(f"Failed to cleanup temp directory: {e}")
+            yield path
+        finally:
+            self.downloader.temp_path = self.temp_dir
 
     @property
     def audio_downloader(self):
@@ -91,12 +89,70 @@ class SpotifyWorker(BaseWorker):
             )
         return self._episode_video_downloader
 
-    def _download_spotify_content(self, url: str) -> Path:
-        """Internal synchronous download method"""
-        url_info = self.downloader.get_url_info(url)
+    def warm_up(self):
+        """Build the whole lazily created downloader chain up front"""
+        return self.episode_video_downloader
 
+    def refresh_auth(self):
+        """Renew the Spotify session token if it has expired"""
+        self.spotify_api._refresh_session_auth()
+
+    def get_episode_id(self, url: str) -> str:
+        """Resolve the Spotify episode id an url points at"""
+        return self.downloader.get_url_info(url).id
+
+    def _resolve_episode(self, url: str):
+        """Resolve url info, episode metadata and GID metadata for an episode url"""
+        url_info = self.downloader.get_url_info(url)
         media_metadata = self.downloader.spotify_api.get_episode(url_info.id)
         gid_metadata = self.downloader.get_gid_metadata(url_info.id, "episode")
+        return url_info, media_metadata, gid_metadata
+
+    def get_duration_seconds(self, url: str) -> Optional[float]:
+        """Episode length from Spotify's metadata, without downloading anything"""
+        url_info = self.downloader.get_url_info(url)
+        duration_ms = self.downloader.spotify_api.get_episode(url_info.id).get("duration_ms")
+        return duration_ms / 1000 if duration_ms else None
+
+    def _download_spotify_window(
+        self,
+        url: str,
+        start_seconds: int,
+        end_seconds: int,
+        padding_seconds: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Optional[Tuple[Path, int]]:
+        """
+        Fetch only the part of an episode covering start_seconds..end_seconds.
+        Returns the window file and the episode time its first frame maps to,
+        or None when the episode has no directly addressable stream.
+        """
+        url_info, media_metadata, gid_metadata = self._resolve_episode(url)
+
+        # Only externally hosted, unencrypted episodes can be range-read over
+        # HTTP; video and DRM-protected audio still go through votify.
+        stream_url = gid_metadata.get("external_url")
+        if not stream_url or gid_metadata.get("video"):
+            return None
+
+        window_start = max(0, start_seconds - padding_seconds)
+        window_end = end_seconds + padding_seconds
+        file_extension = Path(urlparse(stream_url).path).suffix or ".mp3"
+        # The window outlives the download workspace (the ffmpeg stage deletes
+        # it), so it sits in dest_dir under a name no other job can share
+        window_path = self.dest_dir / f"{url_info.id}_{window_start}-{window_end}_{uuid.uuid4().hex[:8]}{file_extension}"
+
+        # Input-side seeking makes ffmpeg issue HTTP range requests, so only
+        # the bytes around the window are transferred.
+        stream = ffmpeg.input(stream_url, ss=window_start, t=window_end - window_start)
+        stream = ffmpeg.output(stream, str(window_path), c='copy')
+        run_with_progress(stream, window_end - window_start, on_progress)
+
+        return window_path, window_start
+
+    def _download_spotify_content(self, url: str) -> Path:
+        """Internal synchronous download method"""
+        url_info, media_metadata, gid_metadata = self._resolve_episode(url)
 
         tags = self.episode_downloader.get_tags(
             episode_metadata=media_metadata,
@@ -136,7 +192,6 @@ class SpotifyWorker(BaseWorker):
             duration = end_seconds - start_seconds
 
             # Process video using ffmpeg
-            import ffmpeg
             stream = ffmpeg.input(str(input_path))
             stream = ffmpeg.output(
                 stream,
@@ -160,3 +215,39 @@ class SpotifyWorker(BaseWorker):
         if len(parts) == 2:
             return int(parts[0]) * 60 + int(parts[1])
         return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+def compare_fetches(cookies_path: Path, url: str, start_seconds: int, end_seconds: int, padding_seconds: int) -> dict:
+    """Bytes and wall time of the clip-window fetch against the full episode download"""
+    dest_dir = Path(tempfile.mkdtemp(prefix="fetch-bench-"))
+    try:
+        worker = SpotifyWorker(cookies_path, dest_dir=dest_dir)
+        report = {"url": url, "clip_seconds": end_seconds - start_seconds}
+
+        started = time.monotonic()
+        window = worker._download_spotify_window(url, start_seconds, end_seconds, padding_seconds)
+        if window:
+            report["window_seconds"] = round(time.monotonic() - started, 2)
+            report["window_bytes"] = window[0].stat().st_size
+        else:
+            report["window"] = "not range-addressable, full download only"
+
+        started = time.monotonic()
+        full_path = worker._download_spotify_content(url)
+        report["full_seconds"] = round(time.monotonic() - started, 2)
+        report["full_bytes"] = Path(full_path).stat().st_size
+        return report
+    finally:
+        shutil.rmtree(dest_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Compare a clip-window fetch with the full episode download")
+    parser.add_argument("url")
+    parser.add_argument("start", type=int, help="clip start, seconds")
+    parser.add_argument("end", type=int, help="clip end, seconds")
+    parser.add_argument("--padding", type=int, default=settings.PARTIAL_FETCH_PADDING_SECONDS)
+    args = parser.parse_args()
+
+    print(compare_fetches(settings.SPOTIFY_COOKIES_FILE, args.url, args.start, args.end, args.padding))
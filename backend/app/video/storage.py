@@ -0,0 +1,188 @@
+# backend/app/video/storage.py
+# Where finished clips live: the local filesystem or an S3-compatible bucket
+
+import mimetypes
+import os
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+
+settings = get_settings()
+logger = get_videos_logger()
+
+METRICS_NAMESPACE = "storage"
+
+class Storage(ABC):
+    """Stores finished outputs under keys such as `clips/clip_1_20250101-120000.mp4`"""
+
+    @abstractmethod
+    def put(self, local_path: Path, key: str) -> str:
+        """Take ownership of a local file, store it under key and return the key"""
+
+    @abstractmethod
+    def delete(self, key: str) -> int:
+        """Remove an object, returning the bytes freed (0 if it was missing)"""
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """Size in bytes, or None when the object does not exist"""
+
+    def url(self, key: str, filename: str = None, download: bool = False) -> Optional[str]:
+        """A URL clients can fetch directly, or None when the API must serve the bytes"""
+        return None
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """The object on this machine's disk, when the backend is local"""
+        return None
+
+class LocalStorage(Storage):
+    """Objects are files under `root`; only useful when the API shares that disk"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def local_path(self, key: str) -> Path:
+        # Rows written before storage keys existed hold absolute paths
+        path = Path(key)
+        return path if path.is_absolute() else self.root / key
+
+    def put(self, local_path: Path, key: str) -> str:
+        destination = self.local_path(key)
+        if Path(local_path).resolve() != destination.resolve():
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(local_path), destination)
+        metrics.incr(METRICS_NAMESPACE, "stored_bytes", destination.stat().st_size)
+        return key
+
+    def delete(self, key: str) -> int:
+        path = self.local_path(key)
+        try:
+            size = path.stat().st_size
+            os.remove(path)
+            return size
+        except FileNotFoundError:
+            return 0
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self.local_path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+class S3Storage(Storage):
+    """
+    S3 or any S3-compatible service (MinIO, R2, ...). Uploads stream from disk
+    in multipart chunks and clients download through presigned URLs, so video
+    bytes never pass through the API.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = None,
+        region: str = None,
+        access_key_id: str = None,
+        secret_access_key: str = None,
+        presign_expires: int = 3600,
+        public_endpoint_url: str = None
+    ):
+        # Optional dependency, only needed when this backend is selected
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.presign_expires = presign_expires
+        credentials = {
+            "region_name": region,
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key
+        }
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, **credentials)
+        # Presigned URLs embed the host they were signed for, and browsers
+        # may not reach the endpoint the workers use (e.g. http://minio:9000)
+        self.presign_client = (
+            boto3.client("s3", endpoint_url=public_endpoint_url, **credentials)
+            if public_endpoint_url else self.client
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put(self, local_path: Path, key: str) -> str:
+        size = Path(local_path).stat().st_size
+        content_type = mimetypes.guess_type(str(local_path))[0] or "application/octet-stream"
+        self.client.upload_file(
+            str(local_path),
+            self.bucket,
+            self._object_key(key),
+            ExtraArgs={"ContentType": content_type},
+            Config=self.transfer_config
+        )
+        os.remove(local_path)
+        metrics.incr(METRICS_NAMESPACE, "stored_bytes", size)
+        return key
+
+    def delete(self, key: str) -> int:
+        size = self.size(key) or 0
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        return size
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def url(self, key: str, filename: str = None, download: bool = False) -> str:
+        params = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if filename:
+            disposition = "attachment" if download else "inline"
+            params["ResponseContentDisposition"] = f'{disposition}; filename="{filename}"'
+        return self.presign_client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.presign_expires)
+
+@lru_cache()
+def get_storage() -> Storage:
+    """The configured backend for new outputs"""
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            presign_expires=settings.S3_PRESIGN_EXPIRES_SECONDS,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL
+        )
+    return LocalStorage(settings.STORAGE_LOCAL_ROOT)
+
+@lru_cache()
+def _legacy_storage() -> LocalStorage:
+    return LocalStorage(settings.STORAGE_LOCAL_ROOT)
+
+def storage_for(key: str) -> Storage:
+    """The backend holding an existing key; absolute paths predate storage keys"""
+    return _legacy_storage() if Path(key).is_absolute() else get_storage()
+
+def clip_key(filename: str) -> str:
+    return f"clips/{filename}"
+
+def store_clip(path: Path) -> str:
+    """Publish a finished clip to the configured backend, returning its key"""
+    return get_storage().put(path, clip_key(Path(path).name))
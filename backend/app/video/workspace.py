@@ -0,0 +1,100 @@
+# backend/app/video/workspace.py
+# Per-job scratch directories for download fragments and intermediate files
+
+import json
+import os
+import shutil
+import socket
+import time
+import uuid
+from pathlib import Path
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.logger import get_videos_logger
+from .base import DEFAULT_DEST_DIR
+
+settings = get_settings()
+logger = get_videos_logger()
+
+METRICS_NAMESPACE = "scratch"
+OWNER_FILE = ".owner"
+
+def scratch_root() -> Path:
+    """SCRATCH_DIR when configured (e.g. a tmpfs mount), else next to the extractions"""
+    root = Path(settings.SCRATCH_DIR) if settings.SCRATCH_DIR else DEFAULT_DEST_DIR / "scratch"
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+def scratch_free_bytes() -> int:
+    return shutil.disk_usage(scratch_root()).free
+
+def has_scratch_space(required: int = None) -> bool:
+    """Whether a new job may start without risking a full scratch disk"""
+    required = settings.SCRATCH_MIN_FREE_BYTES if required is None else required
+    free = scratch_free_bytes()
+    metrics.set_gauge(METRICS_NAMESPACE, "free_bytes", free)
+    return free >= required
+
+class ScratchWorkspace:
+    """
+    A private directory for one job, removed when the job leaves the `with`
+    block however it ends. An owner file records the host and pid so that
+    directories left by a killed worker can be told apart from live ones.
+    """
+
+    def __init__(self, label: str, root: Path = None):
+        self.path = (root or scratch_root()) / f"{label}-{uuid.uuid4().hex[:8]}"
+
+    def __enter__(self) -> Path:
+        self.path.mkdir(parents=True)
+        (self.path / OWNER_FILE).write_text(json.dumps({
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "created": time.time()
+        }))
+        return self.path
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.path, ignore_errors=True)
+        return False
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def sweep_orphans(root: Path = None, max_age_seconds: int = None) -> int:
+    """
+    Remove workspaces whose owning process on this host is gone, and any
+    workspace older than max_age_seconds. Called when a worker starts.
+    """
+    root = root or scratch_root()
+    max_age_seconds = settings.SCRATCH_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+    hostname = socket.gethostname()
+    removed = 0
+
+    for path in root.iterdir():
+        if not path.is_dir():
+            continue
+        try:
+            owner = json.loads((path / OWNER_FILE).read_text())
+        except (OSError, ValueError):
+            # No owner file: created before workspaces were tracked, or torn
+            owner = {"created": path.stat().st_mtime}
+
+        pid = owner.get("pid")
+        orphaned = owner.get("host") == hostname and isinstance(pid, int) and pid > 0 and not _pid_alive(pid)
+        expired = time.time() - owner.get("created", 0) > max_age_seconds
+        if orphaned or expired:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info(f"Swept {removed} orphaned scratch workspaces from {root}")
+        metrics.incr(METRICS_NAMESPACE, "orphans_swept", removed)
+    return removed
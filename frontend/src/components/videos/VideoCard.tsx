@@ -8,7 +8,7 @@ interface Video {
   start_time: string;
   end_time: string;
   notes: string;
-  status: 'pending' | 'downloading' | 'processing' | 'completed' | 'failed' | 'expired' | 'cancelled';
+  status: 'pending' | 'waiting' | 'downloading' | 'processing' | 'completed' | 'failed' | 'expired' | 'cancelled';
   progress?: number;
   extraction_datetime: string;
   creator_name: string;
@@ -20,6 +20,7 @@ const getStatusColor = (status: Video['status']): string => {
       return 'bg-green-500';
     case 'processing':
     case 'downloading':
+    case 'waiting':
     case 'pending':
       return 'bg-blue-500';
     case 'failed':
@@ -87,7 +88,7 @@ export function VideoCard({ video, onDelete, onRedownload }: VideoCardProps) {
             {video.status === 'completed' && (
               <button
                 className="p-2 text-gray-600 hover:text-gray-900 dark:text-gray-300 dark:hover:text-white"
-                onClick={() => window.open(`/api/videos/${video.id}/download`, '_blank')}
+                onClick={() => window.open(`${process.env.NEXT_PUBLIC_API_URL}/api/videos/${video.id}/file?download=true`, '_blank')}
                 title="Download video"
               >
                 <DownloadCloud className="h-4 w-4" />
@@ -6,6 +6,7 @@ import { VideoCard } from './VideoCard';
 import { EmptyState } from './EmptyState';
 import { LoadingState } from './LoadingState';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { Button } from '@/components/ui/Button';
 import type { Video, ExtractionUpdate } from '@/types/api';
 import api from '@/lib/axios';
 
@@ -15,14 +16,24 @@ export function VideoGrid() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [operations, setOperations] = useState<Record<string, boolean>>({});
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // The API returns one page at a time, newest first, with the next page's cursor in a header
+  const fetchPage = async (cursor?: string | null) => {
+    const response = await api.get<Video[]>('/api/videos', {
+      params: cursor ? { cursor } : undefined,
+    });
+    setNextCursor(response.headers['x-next-cursor'] ?? null);
+    return response.data;
+  };
 
   const fetchVideos = async () => {
     try {
       setLoading(true);
       setError(null);
 
-      const response = await api.get<Video[]>('/api/videos');
-      setVideos(response.data);
+      setVideos(await fetchPage());
     } catch (err: any) {
       console.error('Error fetching videos:', err);
       const errorMessage = err.response?.status === 404 
@@ -34,6 +45,20 @@ export function VideoGrid() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchPage(nextCursor);
+      setVideos(prevVideos => [...prevVideos, ...page]);
+    } catch (err: any) {
+      console.error('Error fetching more videos:', err);
+      setError(err.response?.data?.detail || 'Failed to load more videos. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (id: string) => {
     try {
       setOperations(prev => ({ ...prev, [id]: true }));
@@ -75,6 +100,27 @@ export function VideoGrid() {
     fetchVideos();
   }, []);
 
+  // Live progress is pushed over one socket instead of polling per video
+  useEffect(() => {
+    const baseUrl = process.env.NEXT_PUBLIC_API_URL || window.location.origin;
+    const socket = new WebSocket(`${baseUrl.replace(/^http/, 'ws')}/api/ws`);
+
+    socket.onmessage = (event) => {
+      const update: ExtractionUpdate = JSON.parse(event.data);
+      if (update.type !== 'extraction_update') return;
+
+      setVideos(prevVideos =>
+        prevVideos.map(video =>
+          String(video.id) === String(update.extraction_id)
+            ? { ...video, status: update.status, progress: update.progress ?? video.progress }
+            : video
+        )
+      );
+    };
+
+    return () => socket.close();
+  }, []);
+
   if (loading) {
     return <LoadingState />;
   }
@@ -114,6 +160,14 @@ export function VideoGrid() {
           />
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} isLoading={loadingMore}>
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
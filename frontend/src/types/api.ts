@@ -2,6 +2,7 @@
 
 export type ExtractionStatus = 
   | 'pending'
+  | 'waiting'
   | 'downloading'
   | 'processing'
   | 'completed'